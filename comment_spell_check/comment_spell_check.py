@@ -20,7 +20,16 @@
 
 """spell check the comments in code."""
 
+# Only light modules are imported here. The spell checker, the comment
+# parser, the bibliography loader and the HTTP library are imported by the
+# functions that need them, so that --version and runs that do not use
+# those features start quickly.
+from __future__ import annotations
+
+import io
 import sys
+import time
+import itertools
 import os
 import fnmatch
 import glob
@@ -28,24 +37,32 @@ import re
 import unicodedata
 import logging
 from pathlib import Path
-from importlib.metadata import version, PackageNotFoundError
-
-from comment_parser import comment_parser
+from typing import TYPE_CHECKING
 
-from spellchecker import SpellChecker
+from comment_parser.parsers import common
 
 from comment_spell_check.utils import parseargs
-from comment_spell_check.utils import bibtex_loader
-from comment_spell_check.utils import create_checker
-from comment_spell_check.utils import url_remove
+from comment_spell_check.utils import scrubber
+from comment_spell_check.utils import report_writers
+from comment_spell_check.utils import sniff
+from comment_spell_check.utils import findings
+from comment_spell_check.utils import blocks
+
+if TYPE_CHECKING:
+    from spellchecker import SpellChecker
 
-__version__ = "unknown"
+# Looked up once for the whole module. The messages about every line and
+# word are debug messages, so by default they are neither formatted nor
+# written, and the functions called for every comment test the level before
+# building their arguments.
+logger = logging.getLogger("comment_spell_check")
 
-try:
-    __version__ = version("comment_spell_check")
-except PackageNotFoundError:
-    # package is not installed
-    pass
+
+def __getattr__(name):
+    """Look up ``__version__`` only when it is asked for."""
+    if name == "__version__":
+        return parseargs.get_version()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 SUFFIX2MIME = {
@@ -93,20 +110,26 @@ def get_mime_type(filepath):
     return SUFFIX2MIME.get(parts[1], "text/plain")
 
 
-def load_text_file(filename):
-    """Parse plain text file as list of ``comment_parser.common.Comment``.
+def load_text_file(filename, text: str = None):
+    """Parse plain text file as list of ``comment_parser.parsers.common.Comment``.
 
     For a regular text file, we don't need to parse it for comments. We
-    just pass every line to the spellchecker.
+    just pass every line to the spellchecker. ``text``, if given, is the
+    already decoded contents of ``filename``.
     """
 
     output = []
     lc = 0
-    with open(filename, encoding="utf-8") as fp:
+    if text is None:
+        fp = open(filename, encoding="utf-8")
+    else:
+        # newline=None splits the lines like reading the file would
+        fp = io.StringIO(text, newline=None)
+    with fp:
         for line in fp:
             line = line.strip()
             lc = lc + 1
-            comment = comment_parser.common.Comment(line, lc)
+            comment = common.Comment(line, lc)
             output.append(comment)
     return output
 
@@ -165,14 +188,13 @@ def spell_check_words(spell_checker: SpellChecker, words: list[str]):
 def find_misspellings(spell: SpellChecker, line: str) -> list[str]:
     """Find misspellings in a line of text."""
 
-    logger = logging.getLogger("comment_spell_check")
     words = filter_string(line)
 
     mistakes = []
 
     for word in words:
         if not (word.lower() in spell or word in spell):
-            logger.info("Misspelled word: %s", word)
+            logger.debug("Misspelled word: %s", word)
             mistakes.append(word)
     return mistakes
 
@@ -180,10 +202,9 @@ def find_misspellings(spell: SpellChecker, line: str) -> list[str]:
 def remove_contractions(word: str):
     """Remove contractions from the word."""
 
-    logger = logging.getLogger("comment_spell_check")
     for contraction in CONTRACTIONS:
         if word.endswith(contraction):
-            logger.info("Contraction: %s -> %s", word, word[: -len(contraction)])
+            logger.debug("Contraction: %s -> %s", word, word[: -len(contraction)])
             return word[: -len(contraction)]
     return word
 
@@ -196,109 +217,299 @@ def remove_prefix(word: str, prefixes: list[str]):
     return word
 
 
+def resolve_misspelling(spell: SpellChecker, error_word: str, prefixes=None):
+    """Return ``error_word``, a word that is not in the dictionary, with its
+    contraction and prefix removed. Return None if the word turns out to be
+    correct once those are removed, or once it is split as a camel case
+    word."""
+
+    logger.debug("    Error: %s", error_word)
+
+    error_word = remove_contractions(error_word)
+
+    prefixes = prefixes or []
+    error_word = remove_prefix(error_word, prefixes)
+
+    if not error_word:
+        return None
+    if error_word in spell or error_word.lower() in spell:
+        return None
+
+    # Try splitting camel case words and checking each sub-word
+    sub_words = split_camel_case(error_word)
+    logger.debug("    Trying splitting camel case word: %s", error_word)
+    logger.debug("    Sub-words: %s", sub_words)
+
+    if len(sub_words) > 1 and spell_check_words(spell, sub_words):
+        return None
+
+    return error_word
+
+
+def comment_text(c: common.Comment, scrub: re.Pattern = None) -> str:
+    """Return the text of comment ``c`` with the matches of the ``scrub``
+    pattern, by default ``scrubber.DEFAULT``, replaced by spaces."""
+
+    return (scrub or scrubber.DEFAULT).sub(" ", c.text())
+
+
+def is_hyphenated(line: str) -> bool:
+    """Return True if ``line`` ends with a word cut by a hyphen."""
+    line = line.rstrip()
+    return line.endswith("-") and line[-2:-1].isalpha()
+
+
+def comment_tokens(
+    c: common.Comment, scrub: re.Pattern = None, spell: SpellChecker = None
+) -> list[tuple[str, int]]:
+    """Return the ``(word, line)`` pairs of the words of comment ``c``.
+
+    The words of a ``blocks.CommentBlock`` are given the line numbers of
+    their own lines. A word hyphenated at the end of one of its lines is
+    joined with the first word of the next line, and if ``spell`` knows
+    the joined word, its two halves are left out.
+    """
+
+    text = comment_text(c, scrub)
+    if not isinstance(c, blocks.CommentBlock):
+        line_number = c.line_number()
+        return [(w, line_number) for w in filter_string(text)]
+
+    lines = text.split("\n")
+    if len(lines) != len(c.line_numbers):
+        # a user pattern removed the end of a line, scrub the lines apart
+        lines = [comment_text(x, scrub) for x in c.comments]
+
+    tokens = []
+    previous = []
+    hyphenated = False
+    for line, line_number in zip(lines, c.line_numbers):
+        current = [(w, line_number) for w in filter_string(line)]
+        if hyphenated and previous and current and spell is not None:
+            joined = previous[-1][0] + current[0][0]
+            if joined in spell or joined.lower() in spell:
+                previous.pop()
+                current.pop(0)
+        tokens.extend(previous)
+        previous = current
+        hyphenated = is_hyphenated(line)
+    tokens.extend(previous)
+
+    return tokens
+
+
+def spell_check_tokens(
+    spell: SpellChecker,
+    tokens: list[tuple[str, int]],
+    prefixes: list[str] = None,
+) -> list[tuple[str, int]]:
+    """Return the ``(word, line)`` pairs of ``tokens`` whose word is
+    misspelled, with their contraction and prefix removed."""
+
+    mistakes = []
+    for word, line_number in tokens:
+        if word.lower() in spell or word in spell:
+            continue
+        logger.debug("Misspelled word: %s", word)
+        word = resolve_misspelling(spell, word, prefixes)
+        if word:
+            mistakes.append((word, line_number))
+
+    return mistakes
+
+
 def spell_check_comment(
     spell: SpellChecker,
-    c: comment_parser.common.Comment,
+    c: common.Comment,
     prefixes: list[str] = None,
+    scrub: re.Pattern = None,
 ) -> list[str]:
-    """Check comment and return list of identified issues if any."""
+    """Check comment and return list of misspelled words if any.
 
-    logger = logging.getLogger("comment_spell_check")
-    logger.info("Line #%d: %s", c.line_number(), c.text())
+    Suggestions for the misspelled words are computed separately, once the
+    whole check is done, by ``suggest.suggest``. ``scrub`` is the pattern
+    of the text removed before checking, as given to ``comment_text``."""
 
-    line = c.text()
-    if "https://" in line or "http://" in line:
-        line = url_remove.remove_urls(line)
-        logger.debug("    Removed URLs: %s", line)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Line #%d: %s", c.line_number(), c.text())
 
-    bad_words = find_misspellings(spell, line)
+    tokens = comment_tokens(c, scrub, spell)
+    return [w for w, _ in spell_check_tokens(spell, tokens, prefixes)]
 
-    mistakes = []
-    for error_word in bad_words:
-        logger.debug("    Error: %s", error_word)
 
-        error_word = remove_contractions(error_word)
+def spell_check_comments_batched(
+    spell: SpellChecker,
+    comments: list[common.Comment],
+    prefixes: list[str] = None,
+    scrub: re.Pattern = None,
+) -> list[tuple[str, int]]:
+    """Check all of ``comments`` at once and return the ``(word, line)``
+    pairs of the misspelled words, in the order they appear.
+
+    The comments are tokenized first. Their unique tokens are then looked
+    up in the dictionary with set operations, and only the tokens left over
+    go through ``resolve_misspelling``, once per token.
+    """
 
-        prefixes = prefixes or []
-        error_word = remove_prefix(error_word, prefixes)
+    tokens = []
+    for c in comments:
+        tokens.extend(comment_tokens(c, scrub, spell))
 
-        if not error_word:
-            continue
-        if error_word in spell or error_word.lower() in spell:
-            continue
+    # The dictionary is a Counter, not a dict, so set operations with it
+    # would copy all of its keys. Probing it with its own membership test
+    # from the standard iterator tools keeps the lookups in C.
+    in_dictionary = spell.word_frequency.dictionary.__contains__
 
-        # Try splitting camel case words and checking each sub-word
-        sub_words = split_camel_case(error_word)
-        logger.debug("    Trying splitting camel case word: %s", error_word)
-        logger.debug("    Sub-words: %s", sub_words)
+    # the word sets of the directory overlays, if any
+    layers = getattr(spell, "layers", ())
 
-        if len(sub_words) > 1 and spell_check_words(spell, sub_words):
-            continue
+    def not_in_dictionary(words):
+        words = set(itertools.filterfalse(in_dictionary, words))
+        for layer in layers:
+            words.difference_update(layer)
+        return words
 
-        msg = f"'{error_word}', " + f"suggestions: {spell.candidates(error_word)}"
-        mistakes.append(msg)
+    # words that are not in the dictionary, as is or in lower case
+    by_lower = {}
+    for word in not_in_dictionary({w for w, _ in tokens}):
+        by_lower.setdefault(word.lower(), []).append(word)
+    unknown = [w for lower in not_in_dictionary(by_lower) for w in by_lower[lower]]
 
-    return mistakes
+    resolved = {}
+    for word in unknown:
+        logger.debug("Misspelled word: %s", word)
+        resolved[word] = resolve_misspelling(spell, word, prefixes)
 
+    return [(resolved[w], n) for w, n in tokens if resolved.get(w)]
 
-def spell_check_file(
-    filename: str,
-    spell_checker: SpellChecker,
-    mime_type: str = "",
-    prefixes=None,
-):
-    """Check spelling in ``filename``."""
+
+def extract_comments(filename: str, mime_type: str = "", text: str = None):
+    """Return the comments of ``filename`` to check, leaving out those
+    between ``spell-check-disable`` and ``spell-check-enable``.
+
+    ``text`` is the decoded contents of ``filename``, as returned by
+    ``sniff.sniff_file``. If it is not given the file is sniffed here.
+    Returns None if the file is skipped or cannot be parsed.
+    """
 
     if len(mime_type) == 0:
         mime_type = get_mime_type(filename)
 
-    logger = logging.getLogger("comment_spell_check")
-    logger.info("spell_check_file: %s, %s", filename, mime_type)
+    logger.debug("spell_check_file: %s, %s", filename, mime_type)
+
+    if text is None:
+        text, _, reason = sniff.sniff_file(filename)
+        if text is None:
+            logger.warning("Skipping %s: %s", filename, reason)
+            return None
 
     # Returns a list of comment_parser.parsers.common.Comments
     if mime_type == "text/plain":
-        clist = load_text_file(filename)
+        clist = load_text_file(filename, text)
     else:
+        from comment_parser import comment_parser
+
         try:
-            clist = comment_parser.extract_comments(filename, mime=mime_type)
-        except TypeError:
+            clist = comment_parser.extract_comments_from_str(text, mime=mime_type)
+        except (TypeError, common.Error):
             logger.error("Parser failed, skipping file %s", filename)
-            return []
+            return None
 
-    bad_words = []
-    line_count = 0
+    checked = []
 
     disable_spell_check = False
 
-    for c in clist:
-        if "spell-check-disable" in c.text().lower():
-            disable_spell_check = True
-            logger.info("    Spell checking disabled")
-            continue
+    for block in blocks.coalesce(clist):
+        lowered = block.text().lower()
+        if isinstance(block, blocks.CommentBlock) and "spell-check-" in lowered:
+            # a directive applies from its own line, so scan the lines apart
+            # and merge the checked ones again
+            items = [(c, c.text().lower()) for c in block.comments]
+        else:
+            items = [(block, lowered)]
 
-        if "spell-check-enable" in c.text().lower():
-            disable_spell_check = False
-            logger.info("    Spell checking enabled")
+        enabled = []
+        for c, lowered in items:
+            if "spell-check-disable" in lowered:
+                disable_spell_check = True
+                logger.debug("    Spell checking disabled")
+                continue
 
-        if disable_spell_check:
-            continue
+            if "spell-check-enable" in lowered:
+                disable_spell_check = False
+                logger.debug("    Spell checking enabled")
+
+            if disable_spell_check:
+                continue
+
+            enabled.append(c)
+
+        checked.extend(blocks.coalesce(enabled) if len(items) > 1 else enabled)
+
+    return checked
+
+
+def check_comments(
+    comments: list[common.Comment],
+    spell_checker: SpellChecker,
+    prefixes=None,
+    batch: bool = False,
+    scrub: re.Pattern = None,
+) -> list[tuple[str, int]]:
+    """Check ``comments``, as returned by ``extract_comments``, and return
+    the sorted ``(word, line)`` pairs of the misspelled words. The matches
+    of the ``scrub`` pattern are removed from the comments first."""
+
+    debug = logger.isEnabledFor(logging.DEBUG)
+
+    if batch:
+        bad_words = spell_check_comments_batched(
+            spell_checker, comments, prefixes=prefixes, scrub=scrub
+        )
+    else:
+        bad_words = []
+        for c in comments:
+            if debug:
+                logger.debug("Line #%d: %s", c.line_number(), c.text())
+            tokens = comment_tokens(c, scrub, spell_checker)
+            mistakes = spell_check_tokens(spell_checker, tokens, prefixes)
+            if debug and mistakes:
+                logger.debug("    %s", ", ".join(m for m, _ in mistakes))
+            bad_words.extend(mistakes)
+
+    bad_words.sort()
+
+    if debug:
+        logger.debug("Results: %s", bad_words)
+
+    return bad_words
 
-        mistakes = spell_check_comment(spell_checker, c, prefixes=prefixes)
-        if len(mistakes) > 0:
-            logger.info("\nLine number %s", c.line_number())
-            logger.info(c.text())
-            for m in mistakes:
-                logger.info("    %s", m)
-                bad_words.append([m, filename, c.line_number()])
-        line_count = line_count + 1
 
-    bad_words = sorted(bad_words)
+def spell_check_file(
+    filename: str,
+    spell_checker: SpellChecker,
+    mime_type: str = "",
+    prefixes=None,
+    text: str = None,
+    batch: bool = False,
+    scrub: re.Pattern = None,
+):
+    """Check spelling in ``filename``.
+
+    ``text`` is the decoded contents of ``filename``, as returned by
+    ``sniff.sniff_file``. If it is not given the file is sniffed here, and
+    skipped if it is binary. With ``batch`` all of the
+    comments of the file are checked at once by
+    ``spell_check_comments_batched``. ``scrub`` is the pattern of the text
+    removed from the comments, ``scrubber.DEFAULT`` by default.
+    """
 
-    logger.info("Results")
-    for x in bad_words:
-        logger.info(x)
+    checked = extract_comments(filename, mime_type, text)
+    if checked is None:
+        return [], 0
 
-    return bad_words, line_count
+    bad_words = check_comments(checked, spell_checker, prefixes, batch, scrub)
+    return [(m, filename, n) for m, n in bad_words], blocks.line_count(checked)
 
 
 def exclude_check(name: str, exclude_list: list[str] = None):
@@ -329,7 +540,6 @@ def build_dictionary_list(args):
     dict_list = []
     initial_dct = Path(__file__).parent / "additional_dictionary.txt"
 
-    logger = logging.getLogger("comment_spell_check")
     if initial_dct.exists():
         dict_list.append(initial_dct)
     else:
@@ -343,46 +553,70 @@ def build_dictionary_list(args):
     return dict_list
 
 
-def add_bibtex_words(spell: SpellChecker, bibtex_files: list[str]):
-    """Add words from bibtex files to the spell checker."""
+def start_checker(args):
+    """Start creating the spell checker in background threads and return the
+    future of a ``(checker, ready_time)`` pair.
 
-    if list is None:
-        return
+    The URL dictionaries are downloaded and the Bibtex files are scanned
+    while the English dictionary loads, and the whole of it runs while the
+    caller finds and reads the files to check.
+    """
 
-    logger = logging.getLogger("comment_spell_check")
+    from concurrent.futures import ThreadPoolExecutor
 
-    for bibtex_file in bibtex_files:
-        logger.info("Loading bibtex file: %s", bibtex_file)
-        bibtex_loader.add_bibtex(spell, bibtex_file)
+    from comment_spell_check.utils import create_checker
 
+    dict_list = build_dictionary_list(args)
+    urls = [d for d in dict_list if create_checker.is_url(d)]
+    bibtex_files = args.bibtex or []
 
-def output_results(args, bad_words):
-    """Output the results of the spell check."""
+    executor = ThreadPoolExecutor(
+        max_workers=1 + len(urls) + len(bibtex_files),
+        thread_name_prefix="comment_spell_check",
+    )
 
-    print("\nBad words\n" if not args.miss else "", end="")
+    downloads = {url: executor.submit(create_checker.fetch_url, url) for url in urls}
 
-    previous_word = ""
+    bibtex = []
+    if bibtex_files:
+        from comment_spell_check.utils import bibtex_loader
 
-    for misspelled_word, found_file, line_num in bad_words:
-        if misspelled_word != previous_word and args.first:
-            print(f"\n{misspelled_word}:")
+        for bibtex_file in bibtex_files:
+            words = executor.submit(
+                bibtex_loader.bibtex_words, bibtex_file, args.bibtex_fields
+            )
+            bibtex.append((bibtex_file, words))
 
-        if (misspelled_word == previous_word) and args.first:
-            sys.stderr.write(".")
-            continue
+    def build():
+        spell = create_checker.create_checker(dict_list, downloads)
+        for bibtex_file, words in bibtex:
+            logger.info("Loading bibtex file: %s", bibtex_file)
+            spell.word_frequency.load_words(words.result())
+        return spell, time.perf_counter()
 
-        if args.vim:
-            print(f"vim +{line_num} {found_file}", file=sys.stderr)
-        else:
-            print(
-                f"file: {found_file:30}  line: {line_num:3d}  ",
-                f"word: {misspelled_word}",
-                file=sys.stderr,
-            )
+    future = executor.submit(build)
+    # the submitted tasks still run, the threads exit once they are done
+    executor.shutdown(wait=False)
+    return future
 
-        previous_word = misspelled_word
 
-    print(f"\n{len(bad_words)} misspellings found")
+def output_results(writer, bad_words, suggestions=None, files=None):
+    """Output the results of the spell check through the report ``writer``.
+
+    ``bad_words`` are sorted ``(word, filename, line)`` findings, or
+    ``findings.Finding`` records of the file table ``files``.
+    ``suggestions`` maps each misspelled word to its suggested corrections.
+    """
+
+    suggestions = suggestions or {}
+
+    writer.start()
+    for word, filename, line in bad_words:
+        if files is not None:
+            filename = files.path(filename)
+        writer.write((word, filename, line, suggestions.get(word)))
+
+    writer.finish(len(bad_words))
 
 
 def setup_logger(args):
@@ -391,13 +625,12 @@ def setup_logger(args):
     level = logging.INFO
     if args.verbose:
         level = logging.DEBUG
-        print("Verbose mode enabled")
+        print("Verbose mode enabled", file=sys.stderr)
     if args.miss:
         level = logging.ERROR
     if args.brief:
         level = logging.WARNING
 
-    logger = logging.getLogger("comment_spell_check")
     logger.setLevel(level)
 
     if level in (logging.INFO, logging.DEBUG):
@@ -418,19 +651,247 @@ def setup_logger(args):
         # Add ch to logger
         logger.addHandler(ch)
 
+    if getattr(args, "trace_sample", 0):
+        # the traces are printed whatever the level of the other messages
+        tracer = logging.getLogger("comment_spell_check.trace")
+        tracer.setLevel(logging.INFO)
+        tracer.propagate = False
+        ch = logging.StreamHandler()
+        ch.setFormatter(
+            logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+        )
+        tracer.addHandler(ch)
+
     return logger
 
 
-def comment_spell_check(args):
-    """comment_spell_check main function."""
-    logger = setup_logger(args)
+def read_file(filename: str, max_size: int, skipped: dict, unreadable: set):
+    """Return the decoded text of ``filename``, or None if it is skipped or
+    cannot be read.
 
-    dict_list = build_dictionary_list(args)
+    A skipped file is recorded in ``skipped`` with the reason it is skipped,
+    and a file that cannot be read is added to ``unreadable``.
+    """
+    try:
+        text, encoding, reason = sniff.sniff_file(filename, max_size)
+    except OSError as e:
+        logger.error("Cannot read %s: %s", filename, e.strerror)
+        unreadable.add(filename)
+        return None
+    unreadable.discard(filename)
+
+    if text is None:
+        logger.warning("Skipping %s: %s", filename, reason)
+        skipped[filename] = reason
+        return None
+    skipped.pop(filename, None)
+
+    if encoding != "utf-8":
+        logger.debug("Decoding %s as %s", filename, encoding)
+    return text
+
+
+def find_files(
+    file_list: list[str],
+    suffixes: list[str],
+    exclude: list[str] = None,
+    skip: list[str] = None,
+):
+    """Yield the files to check: the files of ``file_list``, and the files
+    with one of ``suffixes`` in its directories, that are neither excluded
+    nor skipped."""
+
+    for f in file_list:
+
+        # If f is a directory, recursively check for files in it.
+        if os.path.isdir(f):
+            # f is a directory, so search for files inside
+            dir_entries = []
+            for s in suffixes:
+                dir_entries = dir_entries + glob.glob(f + "/**/*" + s, recursive=True)
+
+            logger.debug("Found %s", dir_entries)
+        else:
+            dir_entries = [f]
+
+        for x in dir_entries:
+            if exclude_check(x, exclude) or skip_check(x, skip):
+                logger.debug("Excluding %s", x)
+                continue
+            yield x
+
+
+def watch_files(
+    args,
+    spell,
+    file_list,
+    suffixes,
+    check,
+    results,
+    suggestions,
+    table,
+    directories=None,
+):
+    """Re-check the files of ``file_list`` as they change, until interrupted.
+
+    ``results`` maps each checked file to its findings, whose files are
+    numbered in ``table``, and is updated in place. ``suggestions`` holds
+    the suggestions of the words seen so far. The findings of the
+    re-checked files are output after each burst of changes. Returns the
+    total number of findings.
+
+    When a word file of the ``directories`` overlays changes, the overlays
+    below it are rebuilt and the files below it checked again.
+    """
+
+    from comment_spell_check.utils import suggest
+    from comment_spell_check.utils import watch
 
-    spell = create_checker.create_checker(dict_list)
+    roots = [f for f in file_list if os.path.isdir(f)]
+    files = {os.path.normpath(f) for f in file_list if not os.path.isdir(f)}
 
-    if args.bibtex:
-        add_bibtex_words(spell, args.bibtex)
+    def under_root(path):
+        for root in roots:
+            root = os.path.normpath(root)
+            if root == "." and not (os.path.isabs(path) or path.startswith("..")):
+                return True
+            if path.startswith(root + os.sep):
+                return True
+        return False
+
+    def accept(path):
+        path = os.path.normpath(path)
+        if directories and os.path.basename(path) == directories.name:
+            return True
+        if path not in files:
+            if not (path.endswith(tuple(suffixes)) and under_root(path)):
+                return False
+            if os.path.basename(path).startswith("."):
+                return False
+        return not (exclude_check(path, args.exclude) or skip_check(path, args.skip))
+
+    # the watcher's paths may be spelled differently from the checked ones
+    names = {os.path.normpath(f): f for f in results}
+
+    # the word files of the directories above the given files
+    word_files = set()
+    if directories:
+        for f in files:
+            word_files.update(directories.word_files(os.path.dirname(f)))
+
+    watcher = watch.create_watcher(roots + sorted(files | word_files), accept)
+    print("\nWatching for changes, press Ctrl-C to stop", file=sys.stderr, flush=True)
+    try:
+        for changed in watch.changes(watcher):
+            if directories:
+                changed = word_files_changed(directories, changed, results)
+            updated = []
+            for path in sorted(changed):
+                filename = names.setdefault(os.path.normpath(path), path)
+                if not os.path.isfile(filename):
+                    logger.info("Removed %s", filename)
+                    results.pop(filename, None)
+                    continue
+                results[filename] = check(filename)
+                updated.extend(results[filename])
+            updated.sort(key=table.sort_key())
+
+            new_words = {x.word for x in updated} - suggestions.keys()
+            suggestions.update(
+                suggest.suggest(
+                    spell,
+                    new_words,
+                    workers=args.suggestion_workers,
+                    budget=args.suggestion_budget,
+                )
+            )
+
+            print(
+                f"\nRe-checked {len(changed)} changed files",
+                file=sys.stderr,
+                flush=True,
+            )
+            writer = report_writers.create_writer(args.format, args.first, True)
+            output_results(writer, updated, suggestions, table)
+
+            total = sum(len(r) for r in results.values())
+            print(
+                f"{total} misspellings found in all files", file=sys.stderr, flush=True
+            )
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+
+    return sum(len(r) for r in results.values())
+
+
+def check_files(files, checker, extract, checker_ready, check_extracted, deadline=None):
+    """Check ``files`` in order, stopping at ``deadline`` if given.
+
+    The comments of the files are extracted with ``extract`` while
+    ``checker`` loads the dictionaries. Until it is done the extracted files
+    are held back, then ``checker_ready`` is called with their number and
+    they are checked with ``check_extracted``. Returns a dictionary mapping
+    each checked file to its findings, and the list of the files left
+    unchecked at the deadline.
+    """
+    results = {}
+    pending = []
+    unchecked = []
+    ready = False
+    for i, f in enumerate(files):
+        if deadline is not None and time.perf_counter() >= deadline:
+            unchecked = files[i:]
+            break
+        comments = extract(f)
+        if ready:
+            results[f] = check_extracted(f, comments)
+            continue
+        pending.append((f, comments))
+        if not checker.done():
+            continue
+        checker_ready(len(pending))
+        ready = True
+        for filename, comments in pending:
+            results[filename] = check_extracted(filename, comments)
+        pending.clear()
+
+    if not ready:
+        checker_ready(len(pending))
+        for filename, comments in pending:
+            results[filename] = check_extracted(filename, comments)
+
+    return results, unchecked
+
+
+def word_files_changed(directories, changed, results):
+    """Rebuild the overlays of ``directories`` below the word files of the
+    ``changed`` files, and return the other ``changed`` files along with
+    the files of ``results`` below those word files."""
+    stale = set()
+    for path in changed:
+        if os.path.basename(path) != directories.name:
+            continue
+        directory = os.path.dirname(os.path.abspath(path))
+        logger.info("Word file changed: %s", path)
+        directories.invalidate(directory)
+        stale.add(directory)
+
+    if not stale:
+        return changed
+
+    prefixes = tuple(d.rstrip(os.sep) + os.sep for d in stale)
+    below = {f for f in results if os.path.abspath(f).startswith(prefixes)}
+    return {f for f in changed if os.path.basename(f) != directories.name} | below
+
+
+def comment_spell_check(args):
+    """comment_spell_check main function."""
+    setup_logger(args)
+
+    started = time.perf_counter()
+    checker = start_checker(args)
 
     file_list = []
     if len(args.filenames):
@@ -440,71 +901,199 @@ def comment_spell_check(args):
 
     prefixes = ["sitk", "itk", "vtk"] + args.prefixes
 
-    bad_words = []
-
     suffixes = [*set(args.suffix)]  # remove duplicates
 
-    logger.info("Prefixes: %s\nSuffixes: %s", prefixes, suffixes)
+    logger.debug("Prefixes: %s\nSuffixes: %s", prefixes, suffixes)
+
+    scrub = scrubber.compile_scrubber(args.no_scrub, args.scrub_patterns)
 
     counts = [0, 0]
+    skipped = {}
+    unreadable = set()
+    table = findings.FileTable()
+
+    # every trace_sample-th file is traced with its timing
+    tracer = logging.getLogger("comment_spell_check.trace")
+    sample = itertools.count(1)
+    traced = {}
+
+    def extract(filename):
+        read_start = time.perf_counter()
+        text = read_file(filename, args.max_file_size, skipped, unreadable)
+        if args.trace_sample and next(sample) % args.trace_sample == 0:
+            traced[filename] = (len(text or ""), read_start)
+        if text is None:
+            return None
+
+        logger.debug("Checking %s", filename)
+        comments = extract_comments(filename, args.mime_type, text)
+        counts[0] = counts[0] + 1
+        if comments is not None:
+            counts[1] = counts[1] + blocks.line_count(comments)
+        if filename in traced:
+            size, read_start = traced[filename]
+            traced[filename] = (size, time.perf_counter() - read_start)
+        return comments
+
+    spell = None
+    directories = None
+
+    def checker_ready(extracted):
+        nonlocal spell, directories
+        waited = time.perf_counter()
+        spell, ready = checker.result()
+        logger.info(
+            "Dictionaries loaded in %.2fs, %.2fs of it while reading %d files",
+            ready - started,
+            min(ready, waited) - started,
+            extracted,
+        )
+
+        if args.directory_dictionary:
+            from comment_spell_check.utils import overlay
+
+            directories = overlay.DirectoryDictionaries(
+                spell, args.directory_dictionary, overlay.tree_tops(file_list)
+            )
+
+    def check_extracted(filename, comments):
+        trace = traced.pop(filename, None)
+        if comments is None:
+            if trace:
+                tracer.info("%s: not checked", filename)
+            return []
+        check_start = time.perf_counter()
+        result = check_comments(
+            comments,
+            directories.checker_for(filename) if directories else spell,
+            prefixes,
+            args.batch,
+            scrub,
+        )
+        result = table.findings(filename, result)
+        if trace:
+            tracer.info(
+                "%s: %d characters, %d comments, read in %.1fms,"
+                " checked in %.1fms, %d misspellings",
+                filename,
+                trace[0],
+                len(comments),
+                trace[1] * 1000,
+                (time.perf_counter() - check_start) * 1000,
+                len(result),
+            )
+        return result
+
+    def check(filename):
+        return check_extracted(filename, extract(filename))
 
     #
-    # Spell check the files
+    # Spell check the files, reading them while the dictionaries load
     #
-    for f in file_list:
+    files = find_files(file_list, suffixes, args.exclude, args.skip)
+    if args.shard:
+        from comment_spell_check.utils import shard
 
-        # If f is a directory, recursively check for files in it.
-        if os.path.isdir(f):
-            # f is a directory, so search for files inside
-            dir_entries = []
-            for s in suffixes:
-                dir_entries = dir_entries + glob.glob(f + "/**/*" + s, recursive=True)
+        files = shard.select_shard(list(files), *args.shard, args.shard_by_size)
+        logger.info("Shard %s/%s: %s files", *args.shard, len(files))
 
-            logger.info(dir_entries)
+    budget = None
+    if args.time_budget is not None:
+        from comment_spell_check.utils import priority
 
-            # spell check the files found in f
-            for x in dir_entries:
-                if exclude_check(x, args.exclude) or skip_check(x, args.skip):
-                    logger.info("Excluding %s", x)
-                    continue
+        budget = priority.TimeBudget(started, args.time_budget)
+        files = budget.order(files)
 
-                logger.info("Checking %s", x)
-                result, lc = spell_check_file(
-                    x,
-                    spell,
-                    args.mime_type,
-                    prefixes=prefixes,
-                )
-                bad_words = sorted(bad_words + result)
-                counts[0] = counts[0] + 1
-                counts[1] = counts[1] + lc
+    results, unchecked = check_files(
+        files,
+        checker,
+        extract,
+        checker_ready,
+        check_extracted,
+        budget.deadline if budget else None,
+    )
 
-        else:
-            # f is a file
-            if exclude_check(f, args.exclude) or skip_check(f, args.skip):
-                logger.info("Excluding %s", f)
-                continue
+    bad_words = [x for result in results.values() for x in result]
+    bad_words.sort(key=table.sort_key())
+
+    #
+    # Suggest corrections, once per misspelled word
+    #
+    from comment_spell_check.utils import suggest
+
+    suggestion_budget = args.suggestion_budget
+    if budget:
+        suggestion_budget = budget.clip(suggestion_budget)
 
-            # f is a file, so spell check it
-            result, lc = spell_check_file(
-                f,
+    suggestions = suggest.suggest(
+        spell,
+        [x.word for x in bad_words],
+        workers=args.suggestion_workers,
+        budget=suggestion_budget,
+    )
+
+    writer = report_writers.create_writer(args.format, args.first, args.miss)
+    output_results(writer, bad_words, suggestions, table)
+
+    logger.info("%s files checked, %s lines checked", counts[0], counts[1])
+    if skipped:
+        logger.warning("%s files skipped", len(skipped))
+    if args.format not in ("text", "vim"):
+        logger.info("%s misspellings found", len(bad_words))
+    if unreadable:
+        logger.error("%s files could not be read", len(unreadable))
+    # an unreadable file fails the check like a misspelling
+    count = len(bad_words) + len(unreadable)
+
+    if budget:
+        budget.report(results, unchecked)
+
+    if args.watch:
+        sys.exit(
+            watch_files(
+                args,
                 spell,
-                args.mime_type,
-                prefixes=prefixes,
+                file_list,
+                suffixes,
+                check,
+                results,
+                suggestions,
+                table,
+                directories,
             )
-            bad_words = sorted(bad_words + result)
-            counts[0] = counts[0] + 1
-            counts[1] = counts[1] + lc
+        )
 
-    output_results(args, bad_words)
+    if budget:
+        sys.exit(budget.exit_status(count, unchecked))
+    sys.exit(count)
 
-    logger.info("%s files checked, %s lines checked", counts[0], counts[1])
+
+def merge_results(args):
+    """Merge the JSON Lines reports of several shards into one report."""
+    from comment_spell_check.utils import shard
+
+    bad_words, table, suggestions = shard.read_results(args.reports)
+
+    writer = report_writers.create_writer(args.format, args.first, args.miss)
+    output_results(writer, bad_words, suggestions, table)
 
     sys.exit(len(bad_words))
 
 
 def main():
     """Parse the command line arguments and call the spell checking function."""
+    if sys.argv[1:2] == ["merge"]:
+        args = parseargs.create_merge_parser().parse_args(sys.argv[2:])
+        setup_logger(args)
+        merge_results(args)
+
+    if sys.argv[1:2] == ["harvest"]:
+        from comment_spell_check.utils import harvest
+
+        args = parseargs.create_harvest_parser().parse_args(sys.argv[2:])
+        setup_logger(args)
+        sys.exit(harvest.harvest(args))
+
     args = parseargs.parse_args()
     comment_spell_check(args)
 
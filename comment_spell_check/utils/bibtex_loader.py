@@ -1,8 +1,28 @@
 """Load Bibtex files into a spell checking dictionary."""
 
+from __future__ import annotations
+
+import re
 import logging
-import bibtexparser
-import spellchecker
+import unicodedata
+from typing import TYPE_CHECKING
+
+from comment_spell_check.utils import cache
+
+if TYPE_CHECKING:
+    import spellchecker
+
+# Entry types that do not have a citation key.
+SKIP_ENTRIES = {"comment", "string", "preamble"}
+
+# Part of the cache key, to be increased whenever the words that
+# `scan_bibtex` finds in a file change.
+SCANNER_VERSION = 2
+
+ENTRY_TYPE = re.compile(r"@\s*(\w+)\s*[{(]")
+ENTRY_KEY = re.compile(r"\s*([^\s,={}()]+)\s*(?:,|$)")
+FIELD_START = re.compile(r"\s*,?\s*([\w.:+-]+)\s*=\s*")
+LATEX_ACCENT = re.compile(r"\\[^a-zA-Z\s]|\\[a-zA-Z]+\s*")
 
 
 def split_bibtex_name(name: str):
@@ -19,21 +39,152 @@ def split_bibtex_name(name: str):
     return words
 
 
-def add_bibtex(spell: spellchecker.SpellChecker, filename: str):
+def value_end(text: str) -> int:
+    """Return the index just past the field value at the start of ``text``,
+    or -1 if the value continues on the next line."""
+    depth = 0
+    quoted = False
+    for i, ch in enumerate(text):
+        if ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth < 0:
+                # closing brace of the entry ends a bare value
+                return i
+            if depth == 0 and not quoted:
+                return i + 1
+        elif ch == '"' and depth == 0:
+            if quoted:
+                return i + 1
+            quoted = True
+        elif ch == "," and depth == 0 and not quoted:
+            return i
+    if depth == 0 and not quoted:
+        return len(text)
+    return -1
+
+
+def latex_words(value: str) -> list[str]:
+    """Split a Bibtex field value into words, dropping LaTeX markup and
+    accents."""
+    value = LATEX_ACCENT.sub("", value).replace("{", "").replace("}", "")
+    value = unicodedata.normalize("NFKD", value)
+    value = "".join([c for c in value if not unicodedata.combining(c)])
+    return [w for w in re.findall(r"[A-Za-z]+", value) if len(w) > 1]
+
+
+def scan_bibtex(lines, fields=()) -> list[str]:
+    """Return the words of the entry keys of the Bibtex file ``lines``, and of
+    the values of ``fields`` if given.
+
+    This is a line based scanner. Unlike a full Bibtex parser it does not
+    build an entry database, it only follows the entries from their start
+    and, if asked for fields, from one field value to the next, carrying its
+    state from one line to the next.
+    """
+    fields = {f.lower() for f in fields}
+    word_list = []
+    want_key = False
+    in_entry = False
+    keep = False
+    pending = None
+
+    for line in lines:
+        if pending is not None:
+            # continuation of a multi-line field value
+            pending = pending + " " + line.strip()
+            end = value_end(pending)
+            if end < 0:
+                continue
+            if keep:
+                word_list.extend(latex_words(pending[:end]))
+            line = pending[end:]
+            pending = None
+
+        while line:
+            if want_key:
+                # the key may be on the line after the entry type
+                if not line.strip():
+                    break
+                want_key = False
+                in_entry = bool(fields)
+                match = ENTRY_KEY.match(line)
+                if match:
+                    word_list.extend(split_bibtex_name(match.group(1)))
+                    line = line[match.end() :]
+                continue
+
+            if in_entry:
+                match = FIELD_START.match(line)
+                if match:
+                    keep = match.group(1).lower() in fields
+                    line = line[match.end() :]
+                    end = value_end(line)
+                    if end < 0:
+                        pending = line.strip()
+                        break
+                    if keep:
+                        word_list.extend(latex_words(line[:end]))
+                    line = line[end:]
+                    continue
+                rest = line.strip().lstrip(",").lstrip()
+                if not rest:
+                    break
+                in_entry = False
+                if rest[0] in "})":
+                    line = rest[1:]
+                    continue
+
+            if "@" not in line:
+                break
+            match = ENTRY_TYPE.search(line)
+            if not match:
+                break
+            want_key = match.group(1).lower() not in SKIP_ENTRIES
+            line = line[match.end() :]
+
+    # remove duplicates, keeping the order
+    return list(dict.fromkeys(word_list))
+
+
+def bibtex_words(filename: str, fields=(), use_cache: bool = True) -> list[str]:
+    """Return the dictionary words found in ``filename``, a Bibtex file.
+
+    The words are cached on disk, keyed by the hash of the file's contents,
+    the version of the scanner and the requested ``fields``.
+    """
+    logger = logging.getLogger("comment_spell_check.bibtex_loader")
+
+    cache_file = None
+    if use_cache:
+        tag = "+".join(sorted(f.lower() for f in fields)) or "keys"
+        digest = cache.file_digest(filename)
+        cache_file = (
+            cache.cache_dir("bibtex") / f"{digest}-v{SCANNER_VERSION}-{tag}.txt"
+        )
+        word_list = cache.read_words(cache_file)
+        if word_list is not None:
+            logger.info("Cached Bibtex words: %s", cache_file)
+            return word_list
+
+    with open(filename, "rt", encoding="utf-8", errors="replace") as fp:
+        word_list = scan_bibtex(fp, fields)
+
+    if cache_file is not None:
+        cache.write_text(cache_file, "\n".join(word_list) + "\n")
+
+    return word_list
+
+
+def add_bibtex(spell: spellchecker.SpellChecker, filename: str, fields=()):
     """Update ``spell`` spell checking dictionary with names
     from ``filename``, a Bibtex file."""
 
     logger = logging.getLogger("comment_spell_check.bibtex_loader")
     logger.info("Bibtex file: %s", filename)
 
-    word_list = []
-
-    with open(filename, "rt", encoding="utf-8") as biblatex_file:
-        bib_database = bibtexparser.load(biblatex_file)
-
-        for k in bib_database.get_entry_dict().keys():
-            words = split_bibtex_name(k)
-            word_list.extend(words)
+    word_list = bibtex_words(filename, fields)
 
-        logger.info("Words: %s", word_list)
-        spell.word_frequency.load_words(word_list)
+    logger.debug("Words: %s", word_list)
+    spell.word_frequency.load_words(word_list)
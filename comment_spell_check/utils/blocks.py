@@ -0,0 +1,63 @@
+"""Merge runs of adjacent single line comments into blocks.
+
+The comment parser returns C++ ``//`` and Python ``#`` comments, and the
+lines of text files, one line at a time. Checked one by one, every line
+costs its own directive scan, scrubber pass and checking call, and a word
+hyphenated at the end of a line is reported as two misspelled halves. A
+block holds a run of such lines as a single comment, and maps each of its
+lines back to its line number in the file, so that every misspelling is
+still reported on its own line.
+"""
+
+from comment_parser.parsers import common
+
+
+class CommentBlock(common.Comment):
+    """Single line comments on consecutive lines, as one comment.
+
+    Its text is the text of the ``comments`` joined by newlines, and
+    ``line_numbers`` gives the line number of each of those lines.
+    """
+
+    def __init__(self, comments: list[common.Comment]):
+        super().__init__(
+            "\n".join(c.text() for c in comments),
+            comments[0].line_number(),
+            multiline=True,
+        )
+        self.comments = comments
+        self.line_numbers = [c.line_number() for c in comments]
+
+    def __repr__(self):
+        return f"CommentBlock({self.line_numbers[0]}-{self.line_numbers[-1]})"
+
+
+def coalesce(comments: list[common.Comment]) -> list[common.Comment]:
+    """Return ``comments`` with each run of single line comments on
+    consecutive lines replaced by a ``CommentBlock``."""
+    result = []
+    run = []
+
+    def flush():
+        if len(run) > 1:
+            result.append(CommentBlock(run[:]))
+        else:
+            result.extend(run)
+        run.clear()
+
+    for c in comments:
+        if run and (c.is_multiline() or c.line_number() != run[-1].line_number() + 1):
+            flush()
+        if c.is_multiline():
+            result.append(c)
+        else:
+            run.append(c)
+    flush()
+
+    return result
+
+
+def line_count(comments: list[common.Comment]) -> int:
+    """Return the number of comments in ``comments``, counting the lines
+    of the blocks."""
+    return sum(len(c.comments) if isinstance(c, CommentBlock) else 1 for c in comments)
@@ -0,0 +1,57 @@
+"""On disk cache shared by the slower comment_spell_check stages."""
+
+import os
+import hashlib
+import logging
+import tempfile
+from pathlib import Path
+
+
+def cache_dir(name: str = "") -> Path:
+    """Return the cache directory for ``name``.
+
+    The cache lives in ``$COMMENT_SPELL_CHECK_CACHE_DIR`` if it is set, and
+    in ``$XDG_CACHE_HOME/comment_spell_check`` (``~/.cache`` by default)
+    otherwise.
+    """
+    root = os.environ.get("COMMENT_SPELL_CHECK_CACHE_DIR")
+    if not root:
+        xdg = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+        root = Path(xdg) / "comment_spell_check"
+    return Path(root) / name
+
+
+def file_digest(filename: str, chunk_size: int = 1 << 20) -> str:
+    """Return the SHA-256 hex digest of the contents of ``filename``."""
+    digest = hashlib.sha256()
+    with open(filename, "rb") as fp:
+        for chunk in iter(lambda: fp.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def read_words(path: Path):
+    """Return the words in cache file ``path``, one per line, or None if the
+    file is not cached."""
+    try:
+        with open(path, encoding="utf-8") as fp:
+            return fp.read().split()
+    except OSError:
+        return None
+
+
+def write_text(path: Path, text: str):
+    """Atomically write ``text`` to cache file ``path``.
+
+    A cache that cannot be written is not an error, it only means the work
+    is redone on the next run.
+    """
+    logger = logging.getLogger("comment_spell_check.cache")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        with os.fdopen(fd, "w", encoding="utf-8") as fp:
+            fp.write(text)
+        os.replace(tmp, path)
+    except OSError as e:
+        logger.debug("Could not write cache file %s: %s", path, e)
@@ -2,15 +2,63 @@
 additional dictionaries if provided.
 """
 
+from __future__ import annotations
+
 import logging
 import importlib.resources
-import spellchecker
-import requests
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import spellchecker
+
+
+def is_url(name: str) -> bool:
+    """Return True if dictionary ``name`` is a URL rather than a file path."""
+    return str(name).startswith(("http://", "https://"))
+
+
+def fetch_url(url: str) -> str | None:
+    """Return the text of the dictionary at ``url``, or None if it cannot be
+    downloaded.
+
+    ``requests`` is only imported when a dictionary is loaded from a URL.
+    """
+    import requests
+
+    logger = logging.getLogger("comment_spell_check.create_checker")
+    try:
+        response = requests.get(url)
+        response.raise_for_status()
+    except requests.exceptions.RequestException as e:
+        logger.error("Error loading dictionary from URL %s: %s", url, e)
+        return None
+    return response.text
 
 
-def create_checker(dict_list: list[str] = None) -> spellchecker.SpellChecker:
+def load_url(checker: spellchecker.SpellChecker, url: str, text: str = None) -> bool:
+    """Load the words of the dictionary at ``url`` into ``checker``.
+
+    ``text``, if given, is the already downloaded dictionary.
+    """
+    if text is None:
+        text = fetch_url(url)
+        if text is None:
+            return False
+    checker.word_frequency.load_text(text)
+    return True
+
+
+def create_checker(
+    dict_list: list[str] = None, downloads: dict = None
+) -> spellchecker.SpellChecker:
     """Create a case sensitive spell checker with the English dictionary and
-    additional dictionaries if provided."""
+    additional dictionaries if provided.
+
+    ``downloads`` optionally maps the URLs of ``dict_list`` to futures of
+    their text, started by ``fetch_url`` while the English dictionary loads.
+    """
+
+    import spellchecker
 
     logger = logging.getLogger("comment_spell_check.create_checker")
 
@@ -31,24 +79,23 @@ def create_checker(dict_list: list[str] = None) -> spellchecker.SpellChecker:
 
     for d in dict_list:
 
-        # load dictionary from URL
-        try:
-            response = requests.get(d)
-            response.raise_for_status()
-            checker.word_frequency.load_text(response.text)
-
-        except requests.exceptions.MissingSchema:
-            # URL didn't work so assume it's a local file path
+        if is_url(d):
+            # load dictionary from URL
+            text = None
+            if downloads and d in downloads:
+                text = downloads[d].result()
+                if text is None:
+                    continue
+            if not load_url(checker, d, text):
+                continue
+        else:
+            # not a URL so assume it's a local file path
             try:
                 checker.word_frequency.load_text_file(d)
             except IOError:
                 logger.error("Error loading %s", d)
                 continue
 
-        except requests.exceptions.RequestException as e:
-            logger.error("Error loading dictionary from URL %s: %s", d, e)
-            continue
-
         logger.info("Loaded %s", d)
         logger.info("%d words", checker.word_frequency.unique_words)
 
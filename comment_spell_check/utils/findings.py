@@ -0,0 +1,62 @@
+"""Compact records of the misspellings found by a check.
+
+A large check can report hundreds of thousands of misspellings, so a
+finding only holds its word, the number of its file in a ``FileTable`` and
+its line. The words are interned, and each file path is stored once, in
+the table. Suggestions are kept apart, once per word, and the findings are
+only turned into text by the report writers.
+"""
+
+import sys
+from typing import NamedTuple
+
+
+class Finding(NamedTuple):
+    """A misspelled word, the id of its file in a ``FileTable`` and its
+    line number."""
+
+    word: str
+    file_id: int
+    line: int
+
+
+class FileTable:
+    """Number the paths of the checked files, storing each path once."""
+
+    def __init__(self):
+        self.paths = []
+        self.ids = {}
+
+    def __len__(self):
+        return len(self.paths)
+
+    def intern(self, path: str) -> int:
+        """Return the id of ``path``, adding it to the table if needed."""
+        file_id = self.ids.get(path)
+        if file_id is None:
+            file_id = self.ids[path] = len(self.paths)
+            self.paths.append(path)
+        return file_id
+
+    def path(self, file_id: int) -> str:
+        """Return the path of the file ``file_id``."""
+        return self.paths[file_id]
+
+    def findings(self, path: str, pairs) -> list[Finding]:
+        """Return the findings of the ``(word, line)`` ``pairs`` of file
+        ``path``."""
+        file_id = self.intern(path)
+        return [Finding(sys.intern(word), file_id, line) for word, line in pairs]
+
+    def sort_key(self):
+        """Return a sort key ordering findings by word, path and line.
+
+        The ids are replaced by the ranks of the sorted paths, so the paths
+        are compared only once per file instead of once per comparison.
+        """
+        rank = [0] * len(self.paths)
+        for i, file_id in enumerate(
+            sorted(range(len(self.paths)), key=self.paths.__getitem__)
+        ):
+            rank[file_id] = i
+        return lambda f: (f.word, rank[f.file_id], f.line)
@@ -0,0 +1,239 @@
+"""Harvest a project dictionary from the identifiers of a source tree.
+
+Unlike ``utils/itk_crawl.py`` and ``utils/sitk_crawl.py``, which import the
+wrapped package and walk ``dir()``, the harvester parses the C++ headers and
+Python modules themselves, so the project does not need to be built or
+installed. Files are parsed across a process pool, and the words of each
+file are cached so that a re-harvest only parses the files that changed.
+"""
+
+import os
+import re
+import ast
+import sys
+import json
+import hashlib
+import logging
+from concurrent.futures import ProcessPoolExecutor
+
+from comment_spell_check.utils import cache
+
+CXX_SUFFIXES = [".h", ".hxx", ".hpp", ".txx", ".c", ".cxx", ".cpp", ".cc"]
+PYTHON_SUFFIXES = [".py"]
+
+CACHE_VERSION = 1
+
+# C++ comments, string and character literals
+CXX_NOISE = re.compile(
+    r"//[^\n]*|/\*.*?\*/|\"(?:\\.|[^\"\\\n])*\"|'(?:\\.|[^'\\\n])*'", re.DOTALL
+)
+
+CXX_PATTERNS = [
+    # class, struct, union, enum and namespace names, after any export macros
+    re.compile(
+        r"\b(?:class|struct|union|enum(?:\s+class)?|namespace)\s+"
+        r"(?:[A-Z][A-Z0-9_]*\s+)*([A-Za-z_]\w*)"
+    ),
+    # function and method names
+    re.compile(r"\b([A-Za-z_]\w*)\s*\("),
+    # type aliases
+    re.compile(r"\busing\s+([A-Za-z_]\w*)\s*="),
+    re.compile(r"\btypedef\b[^;{}]*?\b([A-Za-z_]\w*)\s*;"),
+    # macros
+    re.compile(r"^\s*#\s*define\s+([A-Za-z_]\w*)", re.MULTILINE),
+]
+
+CXX_KEYWORDS = {
+    "alignof",
+    "catch",
+    "decltype",
+    "defined",
+    "delete",
+    "for",
+    "if",
+    "new",
+    "noexcept",
+    "operator",
+    "return",
+    "sizeof",
+    "static_assert",
+    "static_cast",
+    "dynamic_cast",
+    "const_cast",
+    "reinterpret_cast",
+    "switch",
+    "throw",
+    "typeid",
+    "while",
+}
+
+
+def split_identifier(name: str, min_length: int = 3) -> list[str]:
+    """Split identifier ``name`` into dictionary words.
+
+    Identifiers are split at underscores and digits. Camel case words are
+    kept whole, as the spell checker already splits them, and parts shorter
+    than ``min_length`` are dropped.
+    """
+    return [w for w in re.split(r"[_\d]+", name) if len(w) >= min_length]
+
+
+def cxx_identifiers(source: str) -> set[str]:
+    """Return the names declared in C++ ``source``."""
+    source = CXX_NOISE.sub(" ", source)
+    names = set()
+    for pattern in CXX_PATTERNS:
+        names.update(pattern.findall(source))
+    return names - CXX_KEYWORDS
+
+
+def python_identifiers(source: str, filename: str = "<unknown>") -> set[str]:
+    """Return the class, function, method, argument and assigned names in
+    Python ``source``."""
+    tree = ast.parse(source, filename)
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)):
+            names.add(node.name)
+        elif isinstance(node, ast.arg):
+            names.add(node.arg)
+        elif isinstance(node, ast.Name) and isinstance(node.ctx, ast.Store):
+            names.add(node.id)
+        elif isinstance(node, ast.Attribute) and isinstance(node.ctx, ast.Store):
+            names.add(node.attr)
+    return names
+
+
+def harvest_file(filename: str, min_length: int = 3):
+    """Return the sorted dictionary words of the identifiers in ``filename``,
+    or None if it cannot be read."""
+    try:
+        with open(filename, encoding="utf-8", errors="replace") as fp:
+            source = fp.read()
+    except OSError:
+        return None
+
+    if os.path.splitext(filename)[1] in PYTHON_SUFFIXES:
+        try:
+            names = python_identifiers(source, filename)
+        except (SyntaxError, ValueError):
+            return []
+    else:
+        names = cxx_identifiers(source)
+
+    words = set()
+    for name in names:
+        words.update(split_identifier(name, min_length))
+    return sorted(words)
+
+
+def find_sources(paths: list[str], suffixes: list[str], exclude=None) -> list[str]:
+    """Return the sorted source files under ``paths`` with one of
+    ``suffixes``, skipping hidden directories and paths matching any of the
+    ``exclude`` regular expressions."""
+    suffixes = tuple(suffixes)
+    found = set()
+    for path in paths:
+        if os.path.isfile(path):
+            found.add(path)
+            continue
+        for root, dirs, files in os.walk(path):
+            dirs[:] = [d for d in dirs if not d.startswith(".")]
+            for name in files:
+                if name.endswith(suffixes):
+                    found.add(os.path.join(root, name))
+
+    exclude = exclude or []
+    return sorted(f for f in found if not any(re.search(p, f) for p in exclude))
+
+
+def cache_path(paths: list[str], min_length: int):
+    """The cache file of a harvest of ``paths``."""
+    key = "\n".join(sorted(os.path.abspath(p) for p in paths))
+    key = hashlib.sha256(f"{key}\n{min_length}".encode("utf-8")).hexdigest()
+    return cache.cache_dir("harvest") / f"{key}.json"
+
+
+def load_cache(path) -> dict:
+    """Return the per-file entries of harvest cache ``path``."""
+    try:
+        with open(path, encoding="utf-8") as fp:
+            data = json.load(fp)
+    except (OSError, ValueError):
+        return {}
+    if data.get("version") != CACHE_VERSION:
+        return {}
+    return data.get("files", {})
+
+
+def harvest(args) -> int:
+    """Harvest the dictionary words of ``args.paths`` and write them, sorted
+    and without duplicates, to ``args.output``."""
+    logger = logging.getLogger("comment_spell_check.harvest")
+
+    suffixes = args.suffix or CXX_SUFFIXES + PYTHON_SUFFIXES
+    sources = find_sources(args.paths, suffixes, args.exclude)
+
+    cache_file = None
+    entries = {}
+    if not args.no_cache:
+        cache_file = cache_path(args.paths, args.min_length)
+        entries = load_cache(cache_file)
+
+    files = {}
+    todo = []
+    for filename in sources:
+        try:
+            st = os.stat(filename)
+        except OSError as e:
+            logger.warning("Skipping %s: %s", filename, e.strerror)
+            continue
+        stamp = [st.st_mtime_ns, st.st_size]
+        entry = entries.get(filename)
+        if entry is not None and entry["stamp"] == stamp:
+            files[filename] = entry
+        else:
+            files[filename] = {"stamp": stamp, "words": []}
+            todo.append(filename)
+
+    logger.info(
+        "%d source files, %d changed since the last harvest", len(files), len(todo)
+    )
+
+    min_lengths = [args.min_length] * len(todo)
+    executor = None
+    if args.jobs != 1 and len(todo) > 1:
+        executor = ProcessPoolExecutor(max_workers=args.jobs)
+        results = executor.map(harvest_file, todo, min_lengths, chunksize=16)
+    else:
+        results = map(harvest_file, todo, min_lengths)
+
+    for filename, words in zip(todo, results):
+        if words is None:
+            # the file vanished or cannot be read since it was found
+            logger.warning("Skipping %s: cannot be read", filename)
+            del files[filename]
+            continue
+        logger.debug("%s: %d words", filename, len(words))
+        files[filename]["words"] = words
+
+    if executor is not None:
+        executor.shutdown()
+
+    if cache_file is not None:
+        data = {"version": CACHE_VERSION, "files": files}
+        cache.write_text(cache_file, json.dumps(data))
+
+    words = set()
+    for entry in files.values():
+        words.update(entry["words"])
+    text = "".join(f"{w}\n" for w in sorted(words))
+
+    if args.output == "-":
+        sys.stdout.write(text)
+    else:
+        with open(args.output, "w", encoding="utf-8") as fp:
+            fp.write(text)
+
+    logger.info("%d words written to %s", len(words), args.output)
+    return 0
@@ -0,0 +1,138 @@
+"""Per-directory dictionaries, layered over the global spell checker.
+
+A word file (``.spelling-words`` by default) in a directory adds its words
+to the dictionary of the files in that directory and below it. Only the
+word files inside the checked tree are used, so that the results do not
+depend on files elsewhere on the machine. Lookups go
+through a chain of overlays, one per directory with a word file, ending at
+the global spell checker, which is never copied.
+"""
+
+from __future__ import annotations
+
+import os
+import logging
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from spellchecker import SpellChecker
+
+DEFAULT_NAME = ".spelling-words"
+
+
+class DictionaryOverlay:
+    """The words of one directory's word file, over the dictionary of its
+    parent directory.
+
+    It supports the parts of the ``SpellChecker`` interface used by the
+    checking functions: ``in``, ``candidates`` and ``word_frequency``, the
+    latter two being those of the global spell checker. ``layers`` are the
+    word sets of the overlay chain, outermost first.
+    """
+
+    def __init__(self, parent, words: frozenset[str], source: str = ""):
+        self.parent = parent
+        self.words = words
+        self.source = source
+        self.layers = getattr(parent, "layers", ()) + (words,)
+
+    def __contains__(self, word) -> bool:
+        return word in self.words or word in self.parent
+
+    @property
+    def word_frequency(self):
+        """The word frequency of the global spell checker."""
+        return self.parent.word_frequency
+
+    def candidates(self, word):
+        """Suggestions of the global spell checker."""
+        return self.parent.candidates(word)
+
+    def __repr__(self):
+        return f"DictionaryOverlay({self.source!r}, {len(self.words)} words)"
+
+
+def tree_tops(paths: list[str]) -> set[str]:
+    """Return the top directories of the trees of the checked ``paths``:
+    the current directory for the paths inside it, and the directory, or
+    the directory of the file, for the others."""
+    cwd = os.path.abspath(os.curdir)
+    inside = cwd.rstrip(os.sep) + os.sep
+    tops = set()
+    for path in paths:
+        path = os.path.abspath(path)
+        if not os.path.isdir(path):
+            path = os.path.dirname(path)
+        tops.add(cwd if path == cwd or path.startswith(inside) else path)
+    return tops
+
+
+class DirectoryDictionaries:
+    """Find the word files of the directories of the checked files and
+    build their overlays, once per directory for the whole run.
+
+    The search for word files goes up from the directory of a file to the
+    closest of the ``tops`` directories, or to the root of the file system
+    if no ``tops`` are given.
+    """
+
+    def __init__(self, base: SpellChecker, name: str = DEFAULT_NAME, tops=()):
+        self.base = base
+        self.name = name
+        self.tops = {os.path.abspath(t) for t in tops}
+        self._checkers = {}
+
+    def checker_for(self, filename: str):
+        """Return the spell checker for ``filename``: the global checker,
+        or the overlay of the closest directory with a word file."""
+        directory = os.path.dirname(os.path.abspath(filename))
+        return self.directory_checker(directory)
+
+    def directory_checker(self, directory: str):
+        """Return the spell checker of ``directory``."""
+        checker = self._checkers.get(directory)
+        if checker is not None:
+            return checker
+
+        parent = os.path.dirname(directory)
+        if parent == directory or directory in self.tops:
+            checker = self.base
+        else:
+            checker = self.directory_checker(parent)
+
+        word_file = os.path.join(directory, self.name)
+        if os.path.isfile(word_file):
+            words = load_words(word_file)
+            logging.getLogger("comment_spell_check.overlay").info(
+                "Loaded %d words from %s", len(words), word_file
+            )
+            checker = DictionaryOverlay(checker, words, word_file)
+
+        self._checkers[directory] = checker
+        return checker
+
+    def word_files(self, directory: str) -> list[str]:
+        """Return the paths of the word files, existing or not, that apply
+        to the files of ``directory``, closest first."""
+        directory = os.path.abspath(directory)
+        paths = []
+        while True:
+            paths.append(os.path.join(directory, self.name))
+            parent = os.path.dirname(directory)
+            if parent == directory or directory in self.tops:
+                return paths
+            directory = parent
+
+    def invalidate(self, directory: str):
+        """Forget the overlays of ``directory`` and of the directories below
+        it, so that they are built again from their word files."""
+        prefix = directory.rstrip(os.sep) + os.sep
+        for d in list(self._checkers):
+            if d == directory or d.startswith(prefix):
+                del self._checkers[d]
+
+
+def load_words(filename: str) -> frozenset[str]:
+    """Return the words of a word file, one or more per line."""
+    with open(filename, encoding="utf-8", errors="replace") as fp:
+        return frozenset(fp.read().split())
@@ -1,15 +1,43 @@
 """command line argument parser for comment_spell_check."""
 
 import argparse
-from importlib.metadata import version, PackageNotFoundError
+import functools
 
-__version__ = "unknown"
+from comment_spell_check.utils.shard import parse_shard
+from comment_spell_check.utils.scrubber import PATTERNS, parse_pattern
 
-try:
-    __version__ = version("comment_spell_check")
-except PackageNotFoundError:
-    # package is not installed
-    pass
+# formats that can be written once per burst of changes in watch mode
+WATCH_FORMATS = ["text", "vim", "jsonl"]
+
+
+@functools.lru_cache(maxsize=None)
+def get_version():
+    """Return the installed version of comment_spell_check.
+
+    ``importlib.metadata`` is slow to import, so the version is only looked
+    up when it is needed.
+    """
+    from importlib.metadata import version, PackageNotFoundError
+
+    try:
+        return version("comment_spell_check")
+    except PackageNotFoundError:
+        # package is not installed
+        return "unknown"
+
+
+class VersionAction(argparse.Action):
+    """Print the version and exit, like ``action="version"`` but looking the
+    version up only when the option is used."""
+
+    def __init__(self, option_strings, dest=argparse.SUPPRESS, **kwargs):
+        super().__init__(
+            option_strings, dest, nargs=0, default=argparse.SUPPRESS, **kwargs
+        )
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        print(get_version())
+        parser.exit()
 
 
 def create_parser():
@@ -48,10 +76,20 @@ def create_parser():
     parser.add_argument(
         "--vim",
         "-V",
-        action="store_true",
-        default=False,
-        dest="vim",
-        help="Output results in vim command format",
+        action="store_const",
+        const="vim",
+        default="text",
+        dest="format",
+        help="Output results in vim command format. Same as --format vim.",
+    )
+
+    parser.add_argument(
+        "--format",
+        choices=["text", "vim", "jsonl", "sarif", "checkstyle"],
+        default="text",
+        dest="format",
+        help="Output format of the results. The jsonl, sarif and checkstyle"
+        " reports are written to standard output.",
     )
 
     parser.add_argument(
@@ -67,6 +105,16 @@ def create_parser():
         " Argument can also be a URL to a text file with words.",
     )
 
+    parser.add_argument(
+        "--directory-dictionary",
+        default=".spelling-words",
+        metavar="NAME",
+        dest="directory_dictionary",
+        help="Name of the word files whose words are ignored in the files of"
+        " their directory and its sub-directories (default: .spelling-words)."
+        " An empty name disables them.",
+    )
+
     parser.add_argument(
         "--exclude",
         "-e",
@@ -123,6 +171,120 @@ def create_parser():
         help="Set file mime type. File name suffix will be ignored.",
     )
 
+    parser.add_argument(
+        "--scrub-pattern",
+        action="append",
+        type=parse_pattern,
+        default=[],
+        metavar="REGEX",
+        dest="scrub_patterns",
+        help="Remove the text matching this regular expression from the"
+        " comments before checking them. Argument can be passed multiple times.",
+    )
+
+    parser.add_argument(
+        "--no-scrub",
+        action="append",
+        choices=list(PATTERNS),
+        default=[],
+        dest="no_scrub",
+        help="Do not remove this kind of text from the comments before"
+        " checking them. By default inline code, URLs, email addresses, file"
+        " paths, hexadecimal numbers and Doxygen commands are removed."
+        " Argument can be passed multiple times.",
+    )
+
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        default=False,
+        dest="batch",
+        help="Check all the comments of a file at once, looking up each"
+        " distinct word only once.",
+    )
+
+    parser.add_argument(
+        "--shard",
+        type=parse_shard,
+        default=None,
+        metavar="INDEX/COUNT",
+        dest="shard",
+        help="Only check shard INDEX, from 1 to COUNT, of the files, for"
+        " splitting a check between COUNT nodes. Combine the jsonl reports"
+        " of the shards with 'comment_spell_check merge'.",
+    )
+
+    parser.add_argument(
+        "--shard-by-size",
+        action="store_true",
+        default=False,
+        dest="shard_by_size",
+        help="Balance the shards by file size instead of by path hash.",
+    )
+
+    parser.add_argument(
+        "--watch",
+        "-w",
+        action="store_true",
+        default=False,
+        dest="watch",
+        help="After the first check, keep watching the files and re-check"
+        " the ones that change, until interrupted with Ctrl-C. Only works"
+        " with the text, vim and jsonl formats.",
+    )
+
+    parser.add_argument(
+        "--time-budget",
+        type=float,
+        default=None,
+        metavar="SECONDS",
+        dest="time_budget",
+        help="Stop checking files once this time is spent, checking the files"
+        " changed in git, then the files that had misspellings in the previous"
+        " runs, then the most recently modified files first. The files left"
+        " unchecked are listed, and the exit status is 124. When every file"
+        " is checked, the exit status is the number of misspellings, at most"
+        " 123.",
+    )
+
+    parser.add_argument(
+        "--suggestion-budget",
+        type=float,
+        default=None,
+        metavar="SECONDS",
+        dest="suggestion_budget",
+        help="Time allowed for suggesting corrections. Misspelled words that"
+        " do not get a suggestion within the budget are reported without one.",
+    )
+
+    parser.add_argument(
+        "--suggestion-workers",
+        type=int,
+        default=1,
+        metavar="N",
+        dest="suggestion_workers",
+        help="Number of worker processes suggesting corrections.",
+    )
+
+    parser.add_argument(
+        "--trace-sample",
+        type=int,
+        default=0,
+        metavar="N",
+        dest="trace_sample",
+        help="Log the size and the reading and checking times of every Nth"
+        " file, whatever the other logging options.",
+    )
+
+    parser.add_argument(
+        "--max-file-size",
+        type=int,
+        default=10 * 1024 * 1024,
+        metavar="BYTES",
+        dest="max_file_size",
+        help="Skip files larger than this size. 0 checks files of any size.",
+    )
+
     parser.add_argument(
         "--bibtex",
         action="append",
@@ -130,7 +292,133 @@ def create_parser():
         help="Bibtex file to load for additional dictionary words.",
     )
 
-    parser.add_argument("--version", action="version", version=f"{__version__}")
+    parser.add_argument(
+        "--bibtex-field",
+        action="append",
+        choices=["author", "title"],
+        default=[],
+        dest="bibtex_fields",
+        help="Also add the words of this field of the Bibtex entries to the"
+        " dictionary. By default only the entry keys are used."
+        " Argument can be passed multiple times.",
+    )
+
+    parser.add_argument(
+        "--version", action=VersionAction, help="show the version and exit"
+    )
+    return parser
+
+
+def create_merge_parser():
+    """Create the argument parser of the ``merge`` subcommand."""
+    parser = argparse.ArgumentParser(
+        prog="comment_spell_check merge",
+        description="Merge the jsonl reports of the shards of a check into"
+        " one report. The exit status is the total number of misspellings,"
+        " as for a check on a single node.",
+    )
+
+    parser.add_argument("reports", nargs="+", help="jsonl reports of the shards.")
+
+    parser.add_argument(
+        "--format",
+        choices=["text", "vim", "jsonl", "sarif", "checkstyle"],
+        default="text",
+        dest="format",
+        help="Output format of the merged report.",
+    )
+
+    parser.add_argument(
+        "--first",
+        "-f",
+        action="store_true",
+        default=False,
+        dest="first",
+        help="Show only first occurrence of a mispelling",
+    )
+
+    parser.add_argument(
+        "--miss",
+        "-m",
+        action="store_true",
+        default=False,
+        dest="miss",
+        help="Only output the misspelt words",
+    )
+
+    parser.set_defaults(brief=False, verbose=False)
+    return parser
+
+
+def create_harvest_parser():
+    """Create the argument parser of the ``harvest`` subcommand."""
+    parser = argparse.ArgumentParser(
+        prog="comment_spell_check harvest",
+        description="Harvest a dictionary of the class, function, method"
+        " and other identifier names of a C++ and Python source tree.",
+    )
+
+    parser.add_argument("paths", nargs="+", help="Source files or directories.")
+
+    parser.add_argument(
+        "--output",
+        "-o",
+        default="-",
+        help="Dictionary file to write, one word per line."
+        " Defaults to the standard output.",
+    )
+
+    parser.add_argument(
+        "--suffix",
+        "-s",
+        action="append",
+        dest="suffix",
+        help="File name suffix to harvest. Argument can be passed multiple"
+        " times. Defaults to the C++ and Python suffixes.",
+    )
+
+    parser.add_argument(
+        "--exclude",
+        "-e",
+        action="append",
+        dest="exclude",
+        help="Specify regex for excluding files."
+        " Argument can be passed multiple times.",
+    )
+
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=None,
+        help="Number of worker processes. Defaults to the number of CPUs.",
+    )
+
+    parser.add_argument(
+        "--min-length",
+        type=int,
+        default=3,
+        help="Shortest word to add to the dictionary.",
+    )
+
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        default=False,
+        help="Parse every file, instead of only those changed since the"
+        " last harvest.",
+    )
+
+    parser.add_argument(
+        "--verbose",
+        "-v",
+        action="store_true",
+        default=False,
+        dest="verbose",
+        help="Make output verbose",
+    )
+
+    parser.set_defaults(brief=False, miss=False)
     return parser
 
 
@@ -138,4 +426,6 @@ def parse_args(parser=create_parser()):
     """parse the command-line arguments."""
 
     args = parser.parse_args()
+    if args.watch and args.format not in WATCH_FORMATS:
+        parser.error(f"--watch cannot be used with --format {args.format}")
     return args
@@ -0,0 +1,156 @@
+"""Order the files to check when the time for a check is limited.
+
+With a time budget the files most likely to have new misspellings are
+checked first: the files changed in the git working tree, then the files
+that had misspellings in a previous run, then the other files, newest
+first in each group. The misspelled files of a run are remembered in the
+cache for the next one.
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import subprocess
+
+from comment_spell_check.utils import cache
+
+# seconds allowed to the git command
+GIT_TIMEOUT = 2.0
+
+# exit status of a check that ran out of its time budget
+INCOMPLETE = 124
+
+
+def git_changed_files() -> set[str]:
+    """Return the real paths of the modified, added and untracked files
+    of the git working tree of the current directory, if any."""
+    logger = logging.getLogger("comment_spell_check.priority")
+    try:
+        top = subprocess.run(
+            ["git", "rev-parse", "--show-toplevel"],
+            capture_output=True,
+            text=True,
+            timeout=GIT_TIMEOUT,
+            check=True,
+        ).stdout.strip()
+        status = subprocess.run(
+            ["git", "status", "--porcelain", "-z", "--untracked-files=all"],
+            capture_output=True,
+            text=True,
+            timeout=GIT_TIMEOUT,
+            check=True,
+        ).stdout
+    except (OSError, subprocess.SubprocessError) as e:
+        logger.debug("No git status: %s", e)
+        return set()
+
+    changed = set()
+    entries = iter(status.split("\0"))
+    for entry in entries:
+        if len(entry) < 4:
+            continue
+        changed.add(os.path.realpath(os.path.join(top, entry[3:])))
+        if entry[0] in "RC":
+            # the original path of a rename or copy follows
+            next(entries, None)
+    return changed
+
+
+def findings_file():
+    """Return the cache file of the misspelled files of the checks run in
+    the current directory."""
+    key = hashlib.sha256(os.getcwd().encode("utf-8")).hexdigest()[:16]
+    return cache.cache_dir("findings") / f"{key}.json"
+
+
+def read_findings() -> dict:
+    """Return a dictionary mapping the real paths of the files that had
+    misspellings in previous checks to their number of misspellings."""
+    try:
+        with open(findings_file(), encoding="utf-8") as fp:
+            return json.load(fp)
+    except (OSError, ValueError):
+        return {}
+
+
+def write_findings(previous: dict, results: dict):
+    """Update the cached misspelled files ``previous`` with ``results``, a
+    dictionary mapping the checked files to their findings."""
+    counts = dict(previous)
+    for filename, findings in results.items():
+        path = os.path.realpath(filename)
+        if findings:
+            counts[path] = len(findings)
+        else:
+            counts.pop(path, None)
+    cache.write_text(findings_file(), json.dumps(counts, sort_keys=True))
+
+
+def prioritize(files: list[str], changed: set[str], previous: dict) -> list[str]:
+    """Return ``files`` sorted by priority: the ``changed`` files, then the
+    ``previous`` misspelled files, then the others, newest first."""
+
+    def key(filename):
+        path = os.path.realpath(filename)
+        try:
+            mtime = os.path.getmtime(filename)
+        except OSError:
+            mtime = 0
+        if path in changed:
+            group = 0
+        elif path in previous:
+            group = 1
+        else:
+            group = 2
+        return group, -mtime
+
+    return sorted(files, key=key)
+
+
+class TimeBudget:
+    """The time budget of a check started at ``started``, a
+    ``time.perf_counter`` time, and allowed ``seconds``."""
+
+    def __init__(self, started: float, seconds: float):
+        self.seconds = seconds
+        self.deadline = started + seconds
+        self.previous = read_findings()
+
+    def order(self, files) -> list[str]:
+        """Return ``files`` in the order to check them."""
+        return prioritize(list(files), git_changed_files(), self.previous)
+
+    def clip(self, budget):
+        """Return ``budget``, the seconds allowed to a later step of the
+        check, or None for no limit, cut down to the time left."""
+        remaining = max(0.0, self.deadline - time.perf_counter())
+        if budget is None or budget > remaining:
+            return remaining
+        return budget
+
+    def report(self, results: dict, unchecked: list[str]):
+        """Remember the misspelled files of ``results`` for the next check,
+        and report the ``unchecked`` files."""
+        logger = logging.getLogger("comment_spell_check.priority")
+        write_findings(self.previous, results)
+        if unchecked:
+            logger.warning(
+                "Time budget of %ss spent, %s files not checked",
+                self.seconds,
+                len(unchecked),
+            )
+            for f in unchecked:
+                logger.warning("Not checked: %s", f)
+
+    def exit_status(self, count: int, unchecked: list[str]) -> int:
+        """Return the exit status of a check that found ``count``
+        misspellings and left the ``unchecked`` files.
+
+        Exit statuses wrap around at 256, so the number of misspellings of
+        a complete check is capped below ``INCOMPLETE`` to keep them apart.
+        """
+        if unchecked:
+            return INCOMPLETE
+        return min(count, INCOMPLETE - 1)
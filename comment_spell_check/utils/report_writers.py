@@ -0,0 +1,281 @@
+"""Report writers for the results of a spell check.
+
+Every writer receives findings as ``(word, filename, line, suggestions)``
+tuples and writes them through a :class:`BufferedSink`, so that large
+reports are not written one unbuffered line at a time.
+"""
+
+import sys
+import json
+from html import escape
+from pathlib import Path
+from urllib.parse import quote
+
+from comment_spell_check.utils.parseargs import get_version
+
+FORMATS = ["text", "vim", "jsonl", "sarif", "checkstyle"]
+
+TOOL_NAME = "comment_spell_check"
+TOOL_URI = "https://github.com/SimpleITK/CommentSpellCheck"
+RULE_ID = "misspelling"
+SRCROOT = "%SRCROOT%"
+
+
+class BufferedSink:
+    """Collect text and write it to ``stream`` in large chunks."""
+
+    def __init__(self, stream, buffer_size: int = 1 << 16):
+        self._stream = stream
+        self._buffer_size = buffer_size
+        self._parts = []
+        self._size = 0
+
+    def write(self, text: str):
+        """Queue ``text``, flushing once the buffer is full."""
+        self._parts.append(text)
+        self._size += len(text)
+        if self._size >= self._buffer_size:
+            self.flush()
+
+    def flush(self):
+        """Write everything queued so far to the underlying stream."""
+        if self._parts:
+            self._stream.write("".join(self._parts))
+            self._parts = []
+            self._size = 0
+        self._stream.flush()
+
+
+def format_suggestions(suggestions) -> list:
+    """Return ``suggestions`` as a sorted list, or None if there are none."""
+    if suggestions is None:
+        return None
+    return sorted(suggestions)
+
+
+def format_message(word: str, suggestions) -> str:
+    """The human readable message for a misspelled word."""
+    return f"'{word}', suggestions: {suggestions}"
+
+
+def describe(word: str, suggestions) -> str:
+    """A stable, plain text description of a misspelled word."""
+    text = f"Misspelled word '{word}'"
+    if suggestions:
+        text += f", suggestions: {', '.join(sorted(suggestions))}"
+    return text
+
+
+def artifact_location(filename: str) -> dict:
+    """The SARIF ``artifactLocation`` of ``filename``: a forward slash path
+    relative to ``SRCROOT``, the current directory, or an absolute ``file:``
+    URI for the files outside of it."""
+    path = Path(filename).resolve()
+    try:
+        relative = path.relative_to(Path.cwd().resolve())
+    except ValueError:
+        return {"uri": path.as_uri()}
+    return {"uri": quote(relative.as_posix()), "uriBaseId": SRCROOT}
+
+
+class ReportWriter:
+    """Base class of the report writers.
+
+    ``start`` is called once before any finding, ``write`` once per finding,
+    in the order of the findings sorted by word, and ``finish`` once at the
+    end with the total number of findings.
+    """
+
+    def __init__(self, stream=None, first: bool = False, miss: bool = False):
+        self.out = BufferedSink(stream or sys.stdout)
+        self.first = first
+        self.miss = miss
+        self._seen = set()
+
+    def start(self):
+        """Write the report header."""
+
+    def write(self, finding):
+        """Write one finding, honouring ``first``."""
+        if self.first:
+            if finding[0] in self._seen:
+                return
+            self._seen.add(finding[0])
+        self.write_finding(*finding)
+
+    def write_finding(self, word, filename, line, suggestions):
+        """Write one finding."""
+        raise NotImplementedError
+
+    def finish(self, count: int):
+        """Write the report footer and flush the output."""
+        self.out.flush()
+
+
+class TextWriter(ReportWriter):
+    """The human readable report, one line per finding on stderr."""
+
+    def __init__(self, stream=None, first=False, miss=False, err_stream=None):
+        super().__init__(stream, first, miss)
+        self.err = BufferedSink(err_stream or sys.stderr)
+        self._previous = None
+
+    def start(self):
+        if not self.miss:
+            self.out.write("\nBad words\n")
+            self.out.flush()
+
+    def write(self, finding):
+        word, filename, line, suggestions = finding
+        if self.first:
+            if word == self._previous:
+                self.err.write(".")
+                return
+            self.err.flush()
+            self.out.write(f"\n{format_message(word, suggestions)}:\n")
+            self.out.flush()
+        self.write_finding(word, filename, line, suggestions)
+        self._previous = word
+
+    def write_finding(self, word, filename, line, suggestions):
+        self.err.write(
+            f"file: {filename:30}  line: {line:3d}   "
+            f"word: {format_message(word, suggestions)}\n"
+        )
+
+    def finish(self, count):
+        self.err.flush()
+        self.out.write(f"\n{count} misspellings found\n")
+        self.out.flush()
+
+
+class VimWriter(TextWriter):
+    """One ``vim +LINE FILE`` command per finding."""
+
+    def write_finding(self, word, filename, line, suggestions):
+        self.err.write(f"vim +{line} {filename}\n")
+
+
+class JsonLinesWriter(ReportWriter):
+    """One JSON object per line and finding."""
+
+    def write_finding(self, word, filename, line, suggestions):
+        record = {
+            "file": filename,
+            "line": line,
+            "word": word,
+            "suggestions": format_suggestions(suggestions),
+        }
+        self.out.write(json.dumps(record) + "\n")
+
+
+class SarifWriter(ReportWriter):
+    """A SARIF 2.1.0 log."""
+
+    def __init__(self, stream=None, first=False, miss=False):
+        super().__init__(stream, first, miss)
+        self._separator = ""
+        self._locations = {}
+
+    def start(self):
+        driver = {
+            "name": TOOL_NAME,
+            "version": get_version(),
+            "informationUri": TOOL_URI,
+            "rules": [
+                {
+                    "id": RULE_ID,
+                    "shortDescription": {"text": "Misspelled word in a comment"},
+                }
+            ],
+        }
+        header = json.dumps(
+            {
+                "$schema": "https://json.schemastore.org/sarif-2.1.0.json",
+                "version": "2.1.0",
+            }
+        )
+        self.out.write(header[:-1])
+        self.out.write(', "runs": [{"tool": ')
+        self.out.write(json.dumps({"driver": driver}))
+        self.out.write(', "originalUriBaseIds": ')
+        self.out.write(
+            json.dumps({SRCROOT: {"uri": Path.cwd().resolve().as_uri() + "/"}})
+        )
+        self.out.write(', "results": [\n')
+
+    def write_finding(self, word, filename, line, suggestions):
+        if filename not in self._locations:
+            self._locations[filename] = artifact_location(filename)
+        result = {
+            "ruleId": RULE_ID,
+            "level": "warning",
+            "message": {"text": describe(word, suggestions)},
+            "locations": [
+                {
+                    "physicalLocation": {
+                        "artifactLocation": self._locations[filename],
+                        "region": {"startLine": line},
+                    }
+                }
+            ],
+            "properties": {
+                "word": word,
+                "suggestions": format_suggestions(suggestions),
+            },
+        }
+        self.out.write(self._separator + json.dumps(result))
+        self._separator = ",\n"
+
+    def finish(self, count):
+        self.out.write("\n]}]}\n")
+        self.out.flush()
+
+
+class CheckstyleWriter(ReportWriter):
+    """A checkstyle XML report, with one ``<file>`` element per file.
+
+    The findings come sorted by word, so the errors of each file are held
+    back until ``finish`` and written there, sorted by file and line.
+    """
+
+    def __init__(self, stream=None, first=False, miss=False):
+        super().__init__(stream, first, miss)
+        self._errors = {}
+
+    def start(self):
+        self.out.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        self.out.write('<checkstyle version="4.3">\n')
+
+    def write_finding(self, word, filename, line, suggestions):
+        message = escape(describe(word, suggestions))
+        self._errors.setdefault(filename, []).append(
+            (
+                line,
+                f'<error line="{line}" severity="warning" message="{message}"'
+                f' source="{TOOL_NAME}.{RULE_ID}"/>\n',
+            )
+        )
+
+    def finish(self, count):
+        for filename in sorted(self._errors):
+            self.out.write(f'<file name="{escape(filename)}">\n')
+            for _, error in sorted(self._errors[filename], key=lambda e: e[0]):
+                self.out.write(error)
+            self.out.write("</file>\n")
+        self.out.write("</checkstyle>\n")
+        self.out.flush()
+
+
+WRITERS = {
+    "text": TextWriter,
+    "vim": VimWriter,
+    "jsonl": JsonLinesWriter,
+    "sarif": SarifWriter,
+    "checkstyle": CheckstyleWriter,
+}
+
+
+def create_writer(fmt: str = "text", first: bool = False, miss: bool = False):
+    """Create the report writer for output format ``fmt``."""
+    return WRITERS[fmt](first=first, miss=miss)
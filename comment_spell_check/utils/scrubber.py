@@ -0,0 +1,78 @@
+"""Remove the parts of a comment that are not prose before it is checked.
+
+URLs, email addresses, file paths, hexadecimal numbers, Doxygen commands
+and inline code are not words to spell check. Left in a comment they are
+split into nonsense words, each of which is looked up, reported and given
+suggestions. The patterns matching them are combined into a single
+regular expression, compiled once, so that a comment is scrubbed in a
+single pass.
+"""
+
+import re
+import argparse
+
+# The built in patterns, by name. Their order matters where two of them
+# can match at the same place, e.g. a URL is also a path.
+PATTERNS = {
+    # `code` and ``code``
+    "code": r"``[^\n]*?``|`[^`\n]*`",
+    "url": r"\b[a-zA-Z][a-zA-Z0-9+.-]*://\S+|\bwww\.\S+",
+    "email": r"\b[\w.+-]+@[\w-]+(?:\.[\w-]+)+",
+    # /absolute, ./relative, ~/home and C:\windows paths, paths with two or
+    # more separators, and dir/file.ext
+    "path": r"(?<![\w/\\])(?:[a-zA-Z]:|~|\.{1,2})?[\\/][\w.-]+(?:[\\/][\w.-]+)*"
+    r"|\b[\w.-]+(?:[\\/][\w.-]+){2,}"
+    r"|\b[\w-]+[\\/][\w-]+\.[a-zA-Z]\w*",
+    # 0x1f, #ff00ff, and runs of hexadecimal digits with both digits and
+    # letters, such as hashes
+    "hex": r"\b0[xX][0-9a-fA-F]+\b|#[0-9a-fA-F]{3,8}\b"
+    r"|\b(?=[a-fA-F]*[0-9])(?=[0-9]*[a-fA-F])[0-9a-fA-F]{6,}\b",
+    # \param, @brief
+    "doxygen": r"(?<!\w)[\\@][a-zA-Z]+\b",
+}
+
+
+def parse_pattern(text: str) -> str:
+    """Check that ``text`` is a valid regular expression. Meant as an
+    ``argparse`` type."""
+    try:
+        re.compile(text)
+    except re.error as e:
+        raise argparse.ArgumentTypeError(f"invalid pattern {text!r}: {e}") from None
+    return text
+
+
+# A built in pattern starts a match where it is not preceded by a word
+# character, or on one of the characters that inline code, #ff00ff colors,
+# email addresses and paths can start with right after a letter, and it
+# matches a character of this set before the next space. Testing for it
+# first saves trying each pattern at the start of every plain word, which
+# makes the scrubber several times faster, and leaves the matches as they
+# would be without it.
+GUARD = r"(?:(?<!\w)|(?=[`#.+-]))(?=[^\s`:/@\\#0-9]*[`:/@\\#0-9]|www\.)"
+
+
+def compile_scrubber(disabled=(), extra=(), guard: bool = True) -> re.Pattern:
+    """Return the regular expression matching the built in patterns, but
+    for the ``disabled`` ones, and the ``extra`` patterns.
+
+    ``guard`` False leaves out the ``GUARD`` test, which only changes the
+    speed of the scrubber.
+    """
+    builtins = [p for name, p in PATTERNS.items() if name not in disabled]
+    patterns = list(extra)
+    if builtins:
+        alternation = "(?:" + "|".join(f"(?:{p})" for p in builtins) + ")"
+        patterns.insert(0, GUARD + alternation if guard else alternation)
+    if not patterns:
+        # matches nothing
+        return re.compile(r"(?!)")
+    return re.compile("|".join(f"(?:{p})" for p in patterns))
+
+
+DEFAULT = compile_scrubber()
+
+
+def scrub(text: str, pattern: re.Pattern = DEFAULT) -> str:
+    """Replace the parts of ``text`` matching ``pattern`` by spaces."""
+    return pattern.sub(" ", text)
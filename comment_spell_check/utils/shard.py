@@ -0,0 +1,93 @@
+"""Split the checked files between several CI nodes and merge the results.
+
+Every node discovers the same files and keeps only its own shard of them.
+The assignment only depends on the paths (and, optionally, the sizes) of
+the files, so the shards do not overlap and together cover every file.
+The JSON Lines reports of the shards are then combined by ``merge``.
+"""
+
+import os
+import json
+import zlib
+import argparse
+
+from comment_spell_check.utils import findings
+
+
+def parse_shard(text: str) -> tuple[int, int]:
+    """Parse a ``INDEX/COUNT`` shard specification, with INDEX from 1 to
+    COUNT. Meant as an ``argparse`` type."""
+    try:
+        index, count = (int(x) for x in text.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"invalid shard {text!r}, expected INDEX/COUNT"
+        ) from None
+    if count < 1 or not 1 <= index <= count:
+        raise argparse.ArgumentTypeError(
+            f"invalid shard {text!r}, INDEX must be from 1 to COUNT"
+        )
+    return index, count
+
+
+def path_hash(path: str) -> int:
+    """A hash of ``path`` that is the same on every node and every run."""
+    key = os.path.normpath(path).replace(os.sep, "/")
+    return zlib.crc32(key.encode("utf-8"))
+
+
+def select_shard(files: list[str], index: int, count: int, by_size=False):
+    """Return the files of ``files`` that belong to shard ``index`` of
+    ``count``, keeping their order.
+
+    By default a file's shard is chosen by the hash of its path. With
+    ``by_size`` the files are instead dealt out largest first, each to the
+    shard with the fewest bytes so far, so that the shards take about the
+    same time to check.
+    """
+    if count == 1:
+        return list(files)
+
+    if not by_size:
+        return [f for f in files if path_hash(f) % count == index - 1]
+
+    sizes = {}
+    for f in files:
+        try:
+            sizes[f] = os.path.getsize(f)
+        except OSError:
+            sizes[f] = 0
+
+    totals = [0] * count
+    mine = set()
+    for f in sorted(sizes, key=lambda f: (-sizes[f], path_hash(f), f)):
+        shard = totals.index(min(totals))
+        totals[shard] += sizes[f]
+        if shard == index - 1:
+            mine.add(f)
+    return [f for f in files if f in mine]
+
+
+def read_results(filenames: list[str]) -> tuple:
+    """Read the JSON Lines reports ``filenames`` of the shards.
+
+    Returns the sorted ``findings.Finding`` records, the ``FileTable`` of
+    their files and a dictionary mapping the words to their suggestions.
+    """
+    table = findings.FileTable()
+    results = []
+    suggestions = {}
+    for filename in filenames:
+        with open(filename, encoding="utf-8") as fp:
+            for line in fp:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                file_id = table.intern(record["file"])
+                results.append(
+                    findings.Finding(record["word"], file_id, record["line"])
+                )
+                if record.get("suggestions") is not None:
+                    suggestions[record["word"]] = set(record["suggestions"])
+    results.sort(key=table.sort_key())
+    return results, table, suggestions
@@ -0,0 +1,81 @@
+"""Sniff files before their comments are extracted.
+
+Only the first block of a file is looked at to reject binary files and to
+detect the encoding. Files that pass are read to the end from the same open
+file, so the extractor gets the decoded text without a second read.
+"""
+
+import os
+import codecs
+
+BLOCK_SIZE = 8192
+
+# Byte order marks, longest first as the UTF-32 LE mark starts like UTF-16 LE.
+BOMS = [
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+]
+
+# Control characters that are common in text files: \b \t \n \f \r and escape
+TEXT_CONTROL = {8, 9, 10, 12, 13, 27}
+
+# Largest fraction of other control characters in a text file's first block.
+MAX_CONTROL_RATIO = 0.1
+
+FALLBACK_ENCODING = "latin-1"
+
+
+def is_binary(sample: bytes) -> bool:
+    """Return True if ``sample``, the start of a file, looks binary."""
+    if b"\0" in sample:
+        return True
+    if not sample:
+        return False
+    control = sum(1 for b in sample if (b < 32 and b not in TEXT_CONTROL) or b == 127)
+    return control / len(sample) > MAX_CONTROL_RATIO
+
+
+def detect_encoding(sample: bytes) -> str:
+    """Return the encoding of a file that starts with ``sample``."""
+    for bom, encoding in BOMS:
+        if sample.startswith(bom):
+            return encoding
+    try:
+        # the block may end in the middle of a multi-byte character
+        codecs.getincrementaldecoder("utf-8")().decode(sample, final=False)
+    except UnicodeDecodeError:
+        return FALLBACK_ENCODING
+    return "utf-8"
+
+
+def sniff_file(filename: str, max_size: int = None, block_size: int = BLOCK_SIZE):
+    """Read and decode ``filename``, unless it should be skipped.
+
+    Returns a ``(text, encoding, skip_reason)`` tuple. ``text`` is None, and
+    ``skip_reason`` says why, if the file is larger than ``max_size`` bytes
+    or binary. Raises ``OSError`` if the file does not exist or cannot be
+    read, as that is an error rather than a reason to skip it.
+    """
+    size = os.path.getsize(filename)
+    if max_size and size > max_size:
+        return None, None, f"larger than {max_size} bytes ({size} bytes)"
+
+    with open(filename, "rb") as fp:
+        sample = fp.read(block_size)
+        encoding = detect_encoding(sample)
+        wide = encoding in ("utf-16", "utf-32")
+        if not wide and is_binary(sample):
+            return None, None, "binary file"
+        data = sample + fp.read() if len(sample) == block_size else sample
+
+    try:
+        text = data.decode(encoding)
+    except UnicodeDecodeError:
+        # only the first block was valid UTF-8
+        encoding = FALLBACK_ENCODING
+        text = data.decode(encoding)
+
+    return text, encoding, None
@@ -0,0 +1,91 @@
+"""Suggest corrections for the misspelled words once the check is done.
+
+``SpellChecker.candidates`` is by far the slowest call of a spell check, so
+it is kept off the checking path. It runs once per unique misspelled word,
+optionally across a pool of worker processes, and within a time budget:
+words that did not get their turn before the budget ran out get no
+suggestion.
+"""
+
+from __future__ import annotations
+
+import time
+import logging
+import multiprocessing
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from spellchecker import SpellChecker
+
+# spell checker of a worker process
+_WORKER_CHECKER = None
+
+
+def _init_worker(spell: SpellChecker):
+    global _WORKER_CHECKER
+    _WORKER_CHECKER = spell
+
+
+def _worker_candidates(word: str):
+    return word, _WORKER_CHECKER.candidates(word)
+
+
+def suggest(
+    spell: SpellChecker,
+    words,
+    workers: int = 1,
+    budget: float = None,
+) -> dict:
+    """Return a dictionary mapping each of ``words`` to its suggested
+    corrections, or to None if there are none.
+
+    ``workers`` is the number of worker processes, with 1 computing the
+    suggestions in this process. ``budget`` is the time in seconds that may
+    be spent, None meaning no limit.
+    """
+    logger = logging.getLogger("comment_spell_check.suggest")
+
+    words = sorted(set(words))
+    suggestions = dict.fromkeys(words)
+
+    deadline = None
+    if budget is not None:
+        deadline = time.monotonic() + budget
+
+    done = 0
+    if workers <= 1 or len(words) < 2:
+        for word in words:
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+            suggestions[word] = spell.candidates(word)
+            done = done + 1
+    else:
+        pool = multiprocessing.Pool(
+            min(workers, len(words)), initializer=_init_worker, initargs=(spell,)
+        )
+        try:
+            results = pool.imap_unordered(_worker_candidates, words)
+            while done < len(words):
+                timeout = None
+                if deadline is not None:
+                    timeout = max(0.0, deadline - time.monotonic())
+                try:
+                    word, candidates = results.next(timeout)
+                except multiprocessing.TimeoutError:
+                    break
+                suggestions[word] = candidates
+                done = done + 1
+        finally:
+            # stop the workers still busy with a word past the deadline
+            pool.terminate()
+            pool.join()
+
+    if done < len(words):
+        logger.info(
+            "Suggestion budget of %ss spent, %d of %d words have no suggestions",
+            budget,
+            len(words) - done,
+            len(words),
+        )
+
+    return suggestions
@@ -2,6 +2,11 @@
 
 import re
 
+URL_PATTERN = re.compile(
+    r"(?:https?:\/\/)?[\w.-]+\.[\w.-]+[^\s]*",
+    re.IGNORECASE,
+)
+
 
 def remove_urls(text):
     """
@@ -13,8 +18,4 @@ def remove_urls(text):
     Returns:
         The string with URLs removed.
     """
-    url_pattern = re.compile(
-        r"(?:https?:\/\/)?[\w.-]+\.[\w.-]+[^\s]*",
-        re.IGNORECASE,
-    )
-    return url_pattern.sub("", text)
+    return URL_PATTERN.sub("", text)
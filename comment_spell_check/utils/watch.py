@@ -0,0 +1,229 @@
+"""Watch files and directories for changes.
+
+On Linux the watcher uses inotify, through ``ctypes`` so that no extra
+package is needed. Everywhere else, or if inotify is not available, it
+falls back to polling the modification times of the watched files.
+"""
+
+import os
+import sys
+import time
+import errno
+import select
+import struct
+import ctypes
+import ctypes.util
+import logging
+
+# seconds without any change before a burst of changes is reported
+DEBOUNCE = 0.3
+
+# seconds between two scans of the polling watcher
+POLL_INTERVAL = 1.0
+
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = (
+    IN_MODIFY
+    | IN_CLOSE_WRITE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+    | IN_DELETE_SELF
+)
+
+EVENT_HEADER = struct.Struct("iIII")
+
+
+def walk_dirs(path: str):
+    """Yield ``path`` and its sub-directories, skipping hidden ones."""
+    for root, dirs, _ in os.walk(path):
+        dirs[:] = [d for d in dirs if not d.startswith(".")]
+        yield root
+
+
+class PollingWatcher:
+    """Report changes by comparing the modification times of the files."""
+
+    def __init__(self, paths: list[str], accept, interval: float = POLL_INTERVAL):
+        self.paths = paths
+        self.accept = accept
+        self.interval = interval
+        self.snapshot = self.scan()
+
+    def scan(self) -> dict:
+        """Return the modification time and size of the accepted files."""
+        stamps = {}
+        for path in self.paths:
+            if os.path.isdir(path):
+                names = []
+                for root, dirs, files in os.walk(path):
+                    dirs[:] = [d for d in dirs if not d.startswith(".")]
+                    names.extend(os.path.join(root, f) for f in files)
+            else:
+                names = [path]
+            for name in names:
+                if not self.accept(name):
+                    continue
+                try:
+                    st = os.stat(name)
+                except OSError:
+                    continue
+                stamps[name] = (st.st_mtime_ns, st.st_size)
+        return stamps
+
+    def wait(self, timeout: float = None) -> set[str]:
+        """Wait up to ``timeout`` seconds, forever if None, for changes and
+        return the changed, new and deleted files."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            delay = self.interval
+            if deadline is not None:
+                delay = min(delay, max(0.0, deadline - time.monotonic()))
+            time.sleep(delay)
+
+            snapshot = self.scan()
+            changed = {
+                name
+                for name in snapshot.keys() | self.snapshot.keys()
+                if snapshot.get(name) != self.snapshot.get(name)
+            }
+            self.snapshot = snapshot
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+
+    def close(self):
+        """Release the watcher's resources."""
+
+
+class InotifyWatcher:
+    """Report changes with Linux's inotify."""
+
+    def __init__(self, paths: list[str], accept):
+        libc_name = ctypes.util.find_library("c")
+        if not sys.platform.startswith("linux") or libc_name is None:
+            raise OSError(errno.ENOSYS, "inotify is not available")
+
+        self.libc = ctypes.CDLL(libc_name, use_errno=True)
+        self.fd = self.libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        self.accept = accept
+        self.dirs = {}
+        for path in paths:
+            if os.path.isdir(path):
+                for d in walk_dirs(path):
+                    self.add_watch(d)
+            else:
+                self.add_watch(os.path.dirname(path) or ".")
+
+    def add_watch(self, path: str):
+        """Watch directory ``path``."""
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            logging.getLogger("comment_spell_check.watch").warning(
+                "Cannot watch %s: %s", path, os.strerror(ctypes.get_errno())
+            )
+            return
+        self.dirs[wd] = path
+
+    def read_events(self) -> set[str]:
+        """Return the accepted files of the pending events."""
+        changed = set()
+        try:
+            data = os.read(self.fd, 1 << 16)
+        except BlockingIOError:
+            return changed
+
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset : offset + length].rstrip(b"\0")
+            offset += length
+
+            if mask & IN_IGNORED:
+                self.dirs.pop(wd, None)
+                continue
+            if wd not in self.dirs or not name:
+                continue
+
+            path = os.path.join(self.dirs[wd], os.fsdecode(name))
+            if mask & IN_ISDIR:
+                hidden = os.fsdecode(name).startswith(".")
+                if mask & (IN_CREATE | IN_MOVED_TO) and not hidden:
+                    # a new directory: watch it and report the files in it
+                    for d in walk_dirs(path):
+                        self.add_watch(d)
+                        for f in os.listdir(d):
+                            f = os.path.join(d, f)
+                            if os.path.isfile(f) and self.accept(f):
+                                changed.add(f)
+                continue
+
+            if self.accept(path):
+                changed.add(path)
+        return changed
+
+    def wait(self, timeout: float = None) -> set[str]:
+        """Wait up to ``timeout`` seconds, forever if None, for changes and
+        return the changed, new and deleted files."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None
+            if deadline is not None:
+                remaining = max(0.0, deadline - time.monotonic())
+            ready, _, _ = select.select([self.fd], [], [], remaining)
+            if not ready:
+                return set()
+            changed = self.read_events()
+            if changed:
+                return changed
+
+    def close(self):
+        """Release the watcher's resources."""
+        os.close(self.fd)
+
+
+def create_watcher(paths: list[str], accept):
+    """Return an inotify watcher of ``paths`` if possible, and a polling
+    watcher otherwise. Only the files for which ``accept`` returns True are
+    reported."""
+    logger = logging.getLogger("comment_spell_check.watch")
+    try:
+        watcher = InotifyWatcher(paths, accept)
+        logger.info("Watching %s with inotify", paths)
+    except (OSError, AttributeError) as e:
+        logger.info("inotify not available (%s), polling %s", e, paths)
+        watcher = PollingWatcher(paths, accept)
+    return watcher
+
+
+def changes(watcher, debounce: float = DEBOUNCE):
+    """Yield the sets of files changed by bursts of edits.
+
+    A burst ends once no change is seen for ``debounce`` seconds, so that
+    saving several files, or an editor writing a file in several steps,
+    leads to a single re-check.
+    """
+    while True:
+        changed = watcher.wait()
+        while True:
+            more = watcher.wait(debounce)
+            if not more:
+                break
+            changed |= more
+        yield changed
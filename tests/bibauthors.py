@@ -0,0 +1,4 @@
+# Blezek, Baohua and Stauffer wrote about image registration.
+# Kikinis, Pieper, Griethuysen and Fedorov wrote about radiomics.
+
+print("Hello Authors")
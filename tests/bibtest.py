@@ -3,5 +3,7 @@
 # ibanez2003itk
 # avants2014insight
 # yushkevich2017itk
+# kikinis2014slicer
+# griethuysen2017computational
 
 print("Hello World")
@@ -0,0 +1,9 @@
+# This comment is hyph-
+# enated across two lines, and the misspeled word on
+# this line is on line two.
+# spell-check-disable
+# xqzvoff is not checked
+# spell-check-enable
+# Only mistakke on line seven, a well-
+# known word.
+print("Hi Mom!")
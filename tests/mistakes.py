@@ -0,0 +1,6 @@
+# This comment has a mispeled word.
+#
+# The same mispeled word shows up again, along with a
+# second one: recieve.
+
+print("Goodbye")
@@ -0,0 +1,7 @@
+# Questions go to xqzvuser@example.org or https://qwzx.example.org/xqzv.
+# Data is read from /opt/xqzvdata/qwzxfile.bin, or src/qwzx/xqzv.cxx.
+# The magic number is 0x7f3a, the color #a3f9bc and the hash 9f3ab21ce4.
+# \xqzvparam size is the size, see @qwzxbrief.
+# Call `xqzv_qwzx()` or ``qwzx xqzv`` to set it up.
+# Ticket xqzv-1234 tracks it.
+print("Hi Mom!")
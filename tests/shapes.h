@@ -0,0 +1,14 @@
+// A small header for the dictionary harvester test.
+namespace geom
+{
+class ITK_EXPORT itkShapeFilter : public ShapeBase
+{
+public:
+  using PointerType = itkShapeFilter *;
+
+  /** The area is computed in "SquareUnits" */
+  double ComputeArea(int numSides) const;
+
+  void set_outline_colour(int colour);
+};
+} // end of the namespace
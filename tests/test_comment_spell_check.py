@@ -18,9 +18,38 @@
 #
 # ==========================================================================*/
 
+import os
+import re
+import sys
+import time
+import json
+import signal
+import tempfile
+import threading
 import unittest
 import subprocess
 
+# Modules that must only be imported by the features that need them.
+HEAVY_MODULES = [
+    "spellchecker",
+    "comment_parser.comment_parser",
+    "magic",
+    "requests",
+    "bibtexparser",
+    "comment_spell_check.utils.bibtex_loader",
+]
+
+# Modules that a plain check, without Bibtex files or URL dictionaries,
+# must not import.
+DICTIONARY_MODULES = [
+    "requests",
+    "bibtexparser",
+    "comment_spell_check.utils.bibtex_loader",
+]
+
+# Import time budget of the command line module, in microseconds.
+IMPORT_TIME_BUDGET = 150000
+
 
 class TestCommentSpellCheck(unittest.TestCase):
     """Test class for comment_spell_check command line tool."""
@@ -81,15 +110,219 @@ class TestCommentSpellCheck(unittest.TestCase):
             ],
             cwd="comment_spell_check",
             stdout=subprocess.PIPE,
+            text=True,
             check=False,
         )
         self.assertEqual(runresult.returncode, 0)
 
-        version_string = str(runresult.stdout)
+        version_string = runresult.stdout.strip()
+        self.assertTrue(version_string, "version is not written to stdout")
         self.assertNotEqual(
             version_string, "unknown", "version string contains 'unknown'"
         )
 
+    def test_import_time(self):
+        """Import time budget test"""
+        cases = [
+            (["--version"], HEAVY_MODULES),
+            (
+                ["--miss", "--dict", "dict.txt", "--prefix", "myprefix"]
+                + ["example.h"],
+                DICTIONARY_MODULES,
+            ),
+        ]
+        for options, unused in cases:
+            runresult = subprocess.run(
+                [
+                    sys.executable,
+                    "-X",
+                    "importtime",
+                    "-c",
+                    "from comment_spell_check.comment_spell_check import main; main()",
+                ]
+                + options,
+                cwd="tests",
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                check=False,
+            )
+            self.assertEqual(runresult.returncode, 0, runresult.stderr)
+
+            # lines look like "import time:  self [us] |  cumulative | module"
+            cumulative = {}
+            for line in runresult.stderr.splitlines():
+                if not line.startswith("import time:") or "[us]" in line:
+                    continue
+                _, total, module = line.split("|")
+                cumulative[module.strip()] = int(total)
+
+            for module in unused:
+                self.assertNotIn(module, cumulative, options)
+            self.assertLess(
+                cumulative["comment_spell_check.comment_spell_check"],
+                IMPORT_TIME_BUDGET,
+            )
+
+    def test_batch(self):
+        """Batched lookup test"""
+        outputs = []
+        for options in [[], ["--batch"]]:
+            runresult = subprocess.run(
+                ["comment_spell_check", "--miss", "--suggestion-budget", "0"]
+                + ["--format", "jsonl"]
+                + options
+                + ["../tests/example.h", "../tests/mistakes.py"],
+                cwd="comment_spell_check",
+                stdout=subprocess.PIPE,
+                check=False,
+            )
+            self.assertNotEqual(runresult.returncode, 0, runresult.stdout)
+            outputs.append(runresult.stdout)
+
+        self.assertEqual(outputs[0], outputs[1])
+
+    def test_comment_blocks(self):
+        """Adjacent line comments test"""
+        for options in [[], ["--batch"]]:
+            runresult = subprocess.run(
+                ["comment_spell_check", "--miss", "--suggestion-budget", "0"]
+                + ["--format", "jsonl", "--suffix", ".py"]
+                + options
+                + ["../tests/blocks.py"],
+                cwd="comment_spell_check",
+                stdout=subprocess.PIPE,
+                text=True,
+                check=False,
+            )
+            self.assertEqual(runresult.returncode, 2, runresult.stdout)
+            records = [json.loads(x) for x in runresult.stdout.splitlines()]
+            # the words hyphenated across lines are not reported, and the
+            # others are reported on their own lines
+            self.assertEqual(
+                [(r["word"], r["line"]) for r in records],
+                [("misspeled", 2), ("mistakke", 7)],
+            )
+
+    def test_scrub(self):
+        """Scrubbing of URLs, paths, code and the like test"""
+        cases = [
+            ([], 1),
+            (["--scrub-pattern", r"\bxqzv-\d+"], 0),
+            (["--no-scrub", "email", "--no-scrub", "code"], 6),
+        ]
+        for options, misspellings in cases:
+            runresult = subprocess.run(
+                ["comment_spell_check", "--miss", "--suggestion-budget", "0"]
+                + ["--format", "jsonl", "--suffix", ".py"]
+                + options
+                + ["../tests/scrub.py"],
+                cwd="comment_spell_check",
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                check=False,
+            )
+            self.assertEqual(runresult.returncode, misspellings, runresult.stdout)
+
+    def test_scrub_guard(self):
+        """The scrubber's guard only changes its speed test"""
+        from comment_spell_check.utils import scrubber
+
+        guarded = scrubber.compile_scrubber()
+        plain = scrubber.compile_scrubber(guard=False)
+        scrub_file = os.path.join(os.path.dirname(__file__), "scrub.py")
+        with open(scrub_file, encoding="utf-8") as fp:
+            lines = fp.read().splitlines()
+        lines += [
+            "the`xqzv`now",
+            "color#ff00ff here",
+            "@brief-@X.w and \\param+@x.org",
+            "a.b@c.de, ./src/a.h and C:\\dir\\file",
+            "@x./y/z with 0x1F and deadbeef12",
+        ]
+        for line in lines:
+            self.assertEqual(guarded.sub(" ", line), plain.sub(" ", line), line)
+
+    def test_trace_sample(self):
+        """Sampled trace logging test"""
+        runresult = subprocess.run(
+            ["comment_spell_check", "--suggestion-budget", "0"]
+            + ["--suffix", ".py", "--trace-sample", "1", "../tests/mistakes.py"],
+            cwd="comment_spell_check",
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            check=False,
+        )
+        self.assertEqual(runresult.returncode, 3, runresult.stderr)
+        self.assertRegex(
+            runresult.stderr,
+            r"trace - INFO - ../tests/mistakes.py: \d+ characters, \d+ comments,"
+            r" read in [0-9.]+ms, checked in [0-9.]+ms, 3 misspellings",
+        )
+        # the details of every line are only logged with --verbose
+        self.assertNotIn("Misspelled word", runresult.stderr)
+
+    def test_shard_merge(self):
+        """Sharded check and merge test"""
+        command = ["comment_spell_check", "--miss", "--suggestion-budget", "0"]
+        command += ["--format", "jsonl", "--suffix", ".py", "../tests"]
+
+        single = subprocess.run(
+            command,
+            cwd="comment_spell_check",
+            stdout=subprocess.PIPE,
+            check=False,
+        )
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            reports = []
+            for index in ["1/2", "2/2"]:
+                reports.append(os.path.join(tmp_dir, f"shard{index[0]}.jsonl"))
+                with open(reports[-1], "wb") as fp:
+                    subprocess.run(
+                        command + ["--shard", index, "--shard-by-size"],
+                        cwd="comment_spell_check",
+                        stdout=fp,
+                        check=False,
+                    )
+
+            merged = subprocess.run(
+                ["comment_spell_check", "merge", "--format", "jsonl"] + reports,
+                stdout=subprocess.PIPE,
+                check=False,
+            )
+
+        self.assertNotEqual(single.returncode, 0)
+        self.assertEqual(merged.returncode, single.returncode)
+        self.assertEqual(merged.stdout, single.stdout)
+
+    def test_suggestions(self):
+        """Suggestion workers and budget test"""
+        results = []
+        for options in [
+            ["--suggestion-workers", "2"],
+            ["--suggestion-budget", "0"],
+        ]:
+            runresult = subprocess.run(
+                ["comment_spell_check", "--miss", "--format", "jsonl"]
+                + options
+                + ["../tests/mistakes.py"],
+                cwd="comment_spell_check",
+                stdout=subprocess.PIPE,
+                check=False,
+            )
+            self.assertEqual(runresult.returncode, 3, runresult.stdout)
+            records = [json.loads(x) for x in runresult.stdout.splitlines()]
+            results.append({r["word"]: r["suggestions"] for r in records})
+
+        self.assertIn("misspelled", results[0]["mispeled"])
+        self.assertIn("receive", results[0]["recieve"])
+
+        # with no time for suggestions the words are reported without one
+        self.assertEqual(results[1], {"mispeled": None, "recieve": None})
+
     def test_bibtex(self):
         """Bibtext test"""
         runresult = subprocess.run(
@@ -105,6 +338,358 @@ class TestCommentSpellCheck(unittest.TestCase):
         )
         self.assertEqual(runresult.returncode, 0, runresult.stdout)
 
+    def test_startup_overlap(self):
+        """Background dictionary loading test"""
+        runresult = subprocess.run(
+            [
+                "comment_spell_check",
+                "--dict",
+                "../tests/dict.txt",
+                "--bibtex",
+                "../tests/itk.bib",
+                "--suffix",
+                ".py",
+                "../tests/bibtest.py",
+                "../tests/mistakes.py",
+            ],
+            cwd="comment_spell_check",
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            check=False,
+        )
+        self.assertEqual(runresult.returncode, 3, runresult.stderr)
+        self.assertRegex(
+            runresult.stderr, r"Dictionaries loaded in [0-9.]+s, [0-9.]+s of it"
+        )
+
+    def test_bibtex_fields(self):
+        """Bibtex author and title words test"""
+        with tempfile.TemporaryDirectory() as cache_dir:
+            env = dict(os.environ, COMMENT_SPELL_CHECK_CACHE_DIR=cache_dir)
+            for _ in range(2):
+                # the second run reads the words from the cache
+                runresult = subprocess.run(
+                    [
+                        "comment_spell_check",
+                        "--miss",
+                        "--bibtex",
+                        "../tests/itk.bib",
+                        "--bibtex-field",
+                        "author",
+                        "--bibtex-field",
+                        "title",
+                        "../tests/bibauthors.py",
+                    ],
+                    cwd="comment_spell_check",
+                    stdout=subprocess.PIPE,
+                    env=env,
+                    check=False,
+                )
+                self.assertEqual(runresult.returncode, 0, runresult.stdout)
+            self.assertEqual(len(os.listdir(os.path.join(cache_dir, "bibtex"))), 1)
+
+    def test_harvest(self):
+        """Dictionary harvest test"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            env = dict(os.environ, COMMENT_SPELL_CHECK_CACHE_DIR=tmp_dir)
+            output = os.path.join(tmp_dir, "words.txt")
+            for _ in range(2):
+                # the second run only re-harvests changed files
+                runresult = subprocess.run(
+                    [
+                        "comment_spell_check",
+                        "harvest",
+                        "--jobs",
+                        "2",
+                        "--output",
+                        output,
+                        "../tests/shapes.h",
+                        "../tests/test_comment_spell_check.py",
+                    ],
+                    cwd="comment_spell_check",
+                    stdout=subprocess.PIPE,
+                    env=env,
+                    check=False,
+                )
+                self.assertEqual(runresult.returncode, 0, runresult.stdout)
+
+            with open(output, encoding="utf-8") as fp:
+                words = fp.read().split()
+
+        self.assertEqual(words, sorted(set(words)))
+        for word in [
+            "geom",
+            "itkShapeFilter",
+            "PointerType",
+            "ComputeArea",
+            "outline",
+            "colour",
+            "TestCommentSpellCheck",
+            "setUpClass",
+        ]:
+            self.assertIn(word, words)
+        self.assertNotIn("SquareUnits", words)
+        self.assertNotIn("EXPORT", words)
+
+    def test_harvest_unreadable(self):
+        """Harvest of a tree with a file that cannot be read test"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            env = dict(os.environ, COMMENT_SPELL_CHECK_CACHE_DIR=tmp_dir)
+            source = os.path.join(tmp_dir, "src")
+            os.mkdir(source)
+            with open(os.path.join(source, "good.h"), "w", encoding="utf-8") as fp:
+                fp.write("class GoodShape;\n")
+            os.symlink("missing.h", os.path.join(source, "broken.h"))
+
+            runresult = subprocess.run(
+                ["comment_spell_check", "harvest", source],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                env=env,
+                check=False,
+            )
+        self.assertEqual(runresult.returncode, 0, runresult.stderr)
+        self.assertIn("GoodShape", runresult.stdout.split())
+        self.assertIn("broken.h", runresult.stderr)
+
+    def test_sniff(self):
+        """Binary, encoding and size sniffing test"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with open(os.path.join(tmp_dir, "binary.h"), "wb") as fp:
+                fp.write(b"// \x00\x01\x02 not text\n" * 10)
+            with open(os.path.join(tmp_dir, "latin1.h"), "wb") as fp:
+                fp.write("// A résumé with a mispeled word.\n".encode("latin-1"))
+            with open(os.path.join(tmp_dir, "large.h"), "wb") as fp:
+                fp.write(b"// Anothr mispeled word.\n" * 100)
+
+            runresult = subprocess.run(
+                [
+                    "comment_spell_check",
+                    "--brief",
+                    "--format",
+                    "jsonl",
+                    "--max-file-size",
+                    "1000",
+                    tmp_dir,
+                ],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                check=False,
+            )
+
+        self.assertEqual(runresult.returncode, 1, runresult.stderr)
+        records = [json.loads(x) for x in runresult.stdout.splitlines()]
+        self.assertEqual([r["word"] for r in records], ["mispeled"])
+        self.assertIn("binary.h: binary file", runresult.stderr)
+        self.assertIn("large.h: larger than 1000 bytes", runresult.stderr)
+
+    def test_missing_file(self):
+        """A missing file fails the check test"""
+        runresult = subprocess.run(
+            ["comment_spell_check", "--miss", "--dict", "../tests/dict.txt"]
+            + ["--prefix", "myprefix", "../tests/example.h", "nonexist.h"],
+            cwd="comment_spell_check",
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            check=False,
+        )
+        self.assertEqual(runresult.returncode, 1, runresult.stderr)
+        self.assertIn("Cannot read nonexist.h", runresult.stderr)
+
+    def test_directory_dictionary(self):
+        """Per-directory word file test"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            files = {
+                ".spelling-words": "Foobaz\n",
+                "a.h": "// Foobaz and Quxly\n",
+                "sub/.spelling-words": "Quxly\n",
+                "sub/b.h": "// Foobaz and Quxly\n",
+                "other/c.h": "// Just Quxly\n",
+            }
+            for name, text in files.items():
+                path = os.path.join(tmp_dir, name)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, "w", encoding="utf-8") as fp:
+                    fp.write(text)
+
+            for options in ([], ["--batch"]):
+                runresult = subprocess.run(
+                    ["comment_spell_check", "--brief", "--format", "jsonl"]
+                    + options
+                    + [tmp_dir],
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                    text=True,
+                    check=False,
+                )
+                self.assertEqual(runresult.returncode, 2, runresult.stderr)
+                records = [json.loads(x) for x in runresult.stdout.splitlines()]
+                self.assertEqual(
+                    [(r["word"], os.path.basename(r["file"])) for r in records],
+                    [("Quxly", "a.h"), ("Quxly", "c.h")],
+                )
+
+            runresult = subprocess.run(
+                ["comment_spell_check", "--miss", "--directory-dictionary", ""]
+                + [tmp_dir],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                check=False,
+            )
+            self.assertEqual(runresult.returncode, 5, runresult.stderr)
+
+            # the word files above the checked tree do not apply
+            runresult = subprocess.run(
+                ["comment_spell_check", "--brief", "--format", "jsonl", "."],
+                cwd=os.path.join(tmp_dir, "sub"),
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                check=False,
+            )
+            self.assertEqual(runresult.returncode, 1, runresult.stderr)
+            records = [json.loads(x) for x in runresult.stdout.splitlines()]
+            self.assertEqual([r["word"] for r in records], ["Foobaz"])
+
+    def test_time_budget(self):
+        """Time budget and priority order test"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            env = dict(os.environ, COMMENT_SPELL_CHECK_CACHE_DIR=tmp_dir)
+            for age, name, text in [
+                (300, "a.h", "// Fine words.\n"),
+                (200, "b.h", "// A mispeled word.\n"),
+                (100, "c.h", "// More fine words.\n"),
+            ]:
+                path = os.path.join(tmp_dir, name)
+                with open(path, "w", encoding="utf-8") as fp:
+                    fp.write(text)
+                mtime = time.time() - age
+                os.utime(path, (mtime, mtime))
+
+            command = ["comment_spell_check", "--suggestion-budget", "0"]
+            command += ["--trace-sample", "1", tmp_dir, "--time-budget"]
+
+            runresult = subprocess.run(
+                command + ["0", "--brief"],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                env=env,
+                check=False,
+            )
+            self.assertEqual(runresult.returncode, 124, runresult.stderr)
+            self.assertIn("3 files not checked", runresult.stderr)
+            self.assertEqual(runresult.stderr.count("Not checked: "), 3)
+
+            order = []
+            for _ in range(2):
+                runresult = subprocess.run(
+                    command + ["60"],
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                    text=True,
+                    env=env,
+                    check=False,
+                )
+                self.assertEqual(runresult.returncode, 1, runresult.stderr)
+                traces = re.findall(r"trace - INFO - .*([abc]\.h):", runresult.stderr)
+                order.append(traces)
+
+        # newest first, then the misspelled file of the first run first
+        self.assertEqual(order, [["c.h", "b.h", "a.h"], ["b.h", "c.h", "a.h"]])
+
+    def test_time_budget_status(self):
+        """Exit status of a complete check with a time budget test"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            env = dict(os.environ, COMMENT_SPELL_CHECK_CACHE_DIR=tmp_dir)
+            with open(os.path.join(tmp_dir, "many.h"), "w", encoding="utf-8") as fp:
+                fp.write("// mispeled\n" * 130)
+
+            runresult = subprocess.run(
+                ["comment_spell_check", "--brief", "--suggestion-budget", "0"]
+                + ["--time-budget", "60", tmp_dir],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                env=env,
+                check=False,
+            )
+        # 130 misspellings, capped below the status of an incomplete check
+        self.assertEqual(runresult.returncode, 123, runresult.stderr)
+
+    def test_watch(self):
+        """Watch mode test"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            header = os.path.join(tmp_dir, "watched.h")
+            with open(header, "w", encoding="utf-8") as fp:
+                fp.write("// Nothing wrong here.\n")
+
+            with subprocess.Popen(
+                ["comment_spell_check", "--brief", "--format", "jsonl"]
+                + ["--watch", tmp_dir],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+            ) as proc:
+                watchdog = threading.Timer(60, proc.kill)
+                watchdog.start()
+                try:
+                    for line in proc.stderr:
+                        if line.startswith("Watching for changes"):
+                            break
+
+                    with open(header, "w", encoding="utf-8") as fp:
+                        fp.write("// Now with a mispeled word.\n")
+
+                    totals = []
+                    for line in proc.stderr:
+                        if "in all files" in line:
+                            totals.append(line.strip())
+                            break
+
+                    # a new word file applies to the files below it
+                    words = os.path.join(tmp_dir, ".spelling-words")
+                    with open(words, "w", encoding="utf-8") as fp:
+                        fp.write("mispeled\n")
+
+                    for line in proc.stderr:
+                        if "in all files" in line:
+                            totals.append(line.strip())
+                            break
+                    proc.send_signal(signal.SIGINT)
+                    proc.wait()
+                    report = proc.stdout.read()
+                finally:
+                    watchdog.cancel()
+
+        self.assertEqual(
+            totals,
+            [
+                "1 misspellings found in all files",
+                "0 misspellings found in all files",
+            ],
+        )
+        self.assertEqual(proc.returncode, 0)
+        # the status lines do not end up in the report
+        records = [json.loads(x) for x in report.splitlines()]
+        self.assertEqual([r["word"] for r in records], ["mispeled"])
+
+        # each re-check would add a document to a SARIF or checkstyle report
+        runresult = subprocess.run(
+            ["comment_spell_check", "--watch", "--format", "sarif", "."],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            check=False,
+        )
+        self.assertEqual(runresult.returncode, 2, runresult.stderr)
+        self.assertIn("--watch cannot be used with --format sarif", runresult.stderr)
+
     def test_url(self):
         """URL test"""
         url = (
@@ -124,6 +709,89 @@ class TestCommentSpellCheck(unittest.TestCase):
         )
         self.assertEqual(runresult.returncode, 0, runresult.stdout)
 
+    def test_format_jsonl(self):
+        """JSON Lines output test, with nothing else on stdout"""
+        runresult = subprocess.run(
+            [
+                "comment_spell_check",
+                "--miss",
+                "--verbose",
+                "--format",
+                "jsonl",
+                "../tests/mistakes.py",
+            ],
+            cwd="comment_spell_check",
+            stdout=subprocess.PIPE,
+            check=False,
+        )
+        self.assertEqual(runresult.returncode, 3, runresult.stdout)
+
+        records = [json.loads(x) for x in runresult.stdout.splitlines()]
+        self.assertEqual(
+            [(r["word"], r["line"]) for r in records],
+            [("mispeled", 1), ("mispeled", 3), ("recieve", 4)],
+        )
+        self.assertIn("receive", records[2]["suggestions"])
+
+    def test_format_sarif(self):
+        """SARIF output test"""
+        uris = []
+        for cwd, filename in [
+            ("tests", "mistakes.py"),
+            ("comment_spell_check", "../tests/mistakes.py"),
+        ]:
+            runresult = subprocess.run(
+                ["comment_spell_check", "--miss", "--format", "sarif", filename],
+                cwd=cwd,
+                stdout=subprocess.PIPE,
+                check=False,
+            )
+            self.assertEqual(runresult.returncode, 3, runresult.stdout)
+            run = json.loads(runresult.stdout)["runs"][0]
+            self.assertTrue(run["originalUriBaseIds"]["%SRCROOT%"]["uri"].endswith("/"))
+            location = run["results"][0]["locations"][0]["physicalLocation"]
+            uris.append(location["artifactLocation"])
+
+        self.assertEqual(uris[0], {"uri": "mistakes.py", "uriBaseId": "%SRCROOT%"})
+        self.assertTrue(uris[1]["uri"].startswith("file:///"), uris[1])
+        self.assertTrue(uris[1]["uri"].endswith("/tests/mistakes.py"), uris[1])
+        self.assertNotIn("uriBaseId", uris[1])
+
+    def test_format_checkstyle(self):
+        """checkstyle output test, with one element per file"""
+        runresult = subprocess.run(
+            ["comment_spell_check", "--miss", "--suggestion-budget", "0"]
+            + ["--format", "checkstyle", "--suffix", ".py"]
+            + ["../tests/mistakes.py", "../tests/blocks.py"],
+            cwd="comment_spell_check",
+            stdout=subprocess.PIPE,
+            text=True,
+            check=False,
+        )
+        self.assertEqual(runresult.returncode, 5, runresult.stdout)
+        files = re.findall(r'<file name="([^"]*)">', runresult.stdout)
+        self.assertEqual(files, ["../tests/blocks.py", "../tests/mistakes.py"])
+        lines = re.findall(r'<error line="(\d+)"', runresult.stdout)
+        self.assertEqual(lines, ["2", "7", "1", "3", "4"])
+
+    def test_format_first(self):
+        """--first with a machine readable format test"""
+        runresult = subprocess.run(
+            [
+                "comment_spell_check",
+                "--miss",
+                "--first",
+                "--format",
+                "checkstyle",
+                "../tests/mistakes.py",
+            ],
+            cwd="comment_spell_check",
+            stdout=subprocess.PIPE,
+            check=False,
+        )
+        self.assertEqual(runresult.returncode, 3, runresult.stdout)
+        self.assertEqual(runresult.stdout.count(b"<error "), 2, runresult.stdout)
+
 
 if __name__ == "__main__":
     unittest.main()
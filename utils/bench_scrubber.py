@@ -0,0 +1,59 @@
+#! /usr/bin/env python
+
+"""Compare the scrubber with the former URL removal on real comments.
+
+    python utils/bench_scrubber.py [FILE_OR_DIR ...]
+
+The comments of the given files, by default those of this package, are
+cleaned both ways. For each, the time per comment and the number of words
+left to check are printed.
+"""
+
+import os
+import sys
+import timeit
+import argparse
+
+from comment_spell_check import comment_spell_check as csc
+from comment_spell_check.utils import scrubber
+from comment_spell_check.utils import url_remove
+
+
+def remove_urls(line: str) -> str:
+    """The text cleaning done before the scrubber."""
+    if "https://" in line or "http://" in line:
+        line = url_remove.remove_urls(line)
+    return line
+
+
+def main(argv=None):
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("paths", nargs="*", default=[os.path.dirname(csc.__file__)])
+    parser.add_argument("--suffix", action="append", default=[".py", ".h", ".md"])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    lines = []
+    for filename in csc.find_files(args.paths, args.suffix):
+        comments = csc.extract_comments(filename)
+        lines.extend(c.text() for c in comments or [])
+    if not lines:
+        sys.exit("No comments found")
+
+    print(f"{len(lines)} comments")
+    for name, clean in [("remove_urls", remove_urls), ("scrubber", scrubber.scrub)]:
+        seconds = min(
+            timeit.repeat(
+                lambda: [clean(line) for line in lines], number=1, repeat=args.repeat
+            )
+        )
+        words = sum(len(csc.filter_string(clean(line))) for line in lines)
+        print(
+            f"{name:12} {seconds * 1e6 / len(lines):6.2f} us per comment,"
+            f" {words} words to check"
+        )
+
+
+if __name__ == "__main__":
+    main()